@@ -2,53 +2,353 @@
 FastAPI Application for Legal Contract Analysis
 """
 
+import asyncio
+import copy
+import gzip
+import hashlib
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Annotated, Any, Dict, Final, List, Literal, Optional, Set, Tuple
+
+def _parse_env_value(value: str) -> str:
+    """Unquote a .env value, or drop a trailing " # comment" from an unquoted one."""
+    value = value.strip()
+    if value[:1] in ("'", '"'):
+        end = value.find(value[0], 1)
+        return value[1:end] if end != -1 else value[1:]
+    for i, char in enumerate(value):
+        if char == "#" and i > 0 and value[i - 1].isspace():
+            return value[:i].rstrip()
+    return value
+
+
+def _load_env_file(env_path: Path) -> None:
+    """Set variables from a .env file; ones already in the environment win."""
+    if not env_path.exists():
+        return
+    for line in env_path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("export "):
+            line = line[len("export "):].lstrip()
+        if line and not line.startswith("#") and "=" in line:
+            key, value = line.split("=", 1)
+            os.environ.setdefault(key.strip(), _parse_env_value(value))
+
+
+# Load environment variables from .env.local (for local development);
+# real environment variables take precedence
+_load_env_file(Path(__file__).parent / ".env.local")
+
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, Request, Form, HTTPException, Depends
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, StringConstraints
 
-# Load environment variables from .env.local (for local development)
 try:
-    from dotenv import load_dotenv
-    env_path = Path(__file__).parent / ".env.local"
-    if env_path.exists():
-        load_dotenv(env_path)
+    import brotli
 except ImportError:
-    pass  # python-dotenv not required in production
-
-from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
+    brotli = None  # Brotli is optional; gzip is always available
 
 from contract_analyzer import ContractAnalyzer, ContractAnalysisResult
 
+# The environment doesn't change after startup, so read the key once
+API_KEY = os.getenv("GOOGLE_API_KEY")
+API_KEY_CONFIGURED = bool(API_KEY)
+
+# Upper bound on Gemini generation calls in flight per process (batch, per-contract
+# and streaming calls each take one permit); size it to the account's quota
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "50"))
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the analyzer and start the batching worker once per process."""
+    # Initialize the analyzer with API key from .env.local; without one the UI
+    # and health check still work and analysis requests fail with a 500
+    app.state.analyzer = ContractAnalyzer(api_key=API_KEY) if API_KEY_CONFIGURED else None
+    app.state.gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    batch_scheduler.start(app.state.analyzer, app.state.gemini_semaphore)
+    try:
+        yield
+    finally:
+        await batch_scheduler.stop()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Legal Contract Analyzer",
     description="Analyze legal contracts using Gemini AI",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Initialize the analyzer with API key from .env.local
-analyzer: Optional[ContractAnalyzer] = None
+# Reject oversized uploads from Content-Length before the body is read, and
+# chunked uploads as soon as the bytes received pass the cap
+MAX_REQUEST_BYTES = 256 * 1024
+
+
+class RequestSizeLimitMiddleware:
+    """Return 413 for request bodies larger than max_bytes."""
+    
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+    
+    def _too_large(self) -> ORJSONResponse:
+        return ORJSONResponse(
+            {"detail": f"Request body exceeds {self.max_bytes} bytes."},
+            status_code=413
+        )
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._too_large()(scope, receive, send)
+            return
+        
+        received = 0
+        response_started = False
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside the route, so FastAPI's handler renders the 413
+                    raise HTTPException(status_code=413, detail=f"Request body exceeds {self.max_bytes} bytes.")
+            return message
+        
+        async def tracked_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as exc:
+            # The body was read outside a route (no exception handler in between)
+            if exc.status_code != 413 or response_started:
+                raise
+            await self._too_large()(scope, receive, send)
+
+
+app.add_middleware(RequestSizeLimitMiddleware, max_bytes=MAX_REQUEST_BYTES)
+
+# Compress JSON and static assets. Routes that negotiate their own encoding (/ and
+# /api/analyze) or stream (SSE) are skipped explicitly: older Starlette releases
+# would otherwise buffer the event stream
+GZIP_MIN_SIZE = 500
+UNCOMPRESSED_PATHS = frozenset({"/", "/api/analyze", "/api/analyze/stream"})
+
+
+class ScopedGZipMiddleware:
+    """GZipMiddleware for every path except the excluded ones."""
+    
+    def __init__(self, app, exclude_paths: frozenset, **options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **options)
+        self.exclude_paths = exclude_paths
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await self.gzip(scope, receive, send)
+
+
+app.add_middleware(
+    ScopedGZipMiddleware,
+    exclude_paths=UNCOMPRESSED_PATHS,
+    minimum_size=GZIP_MIN_SIZE,
+    compresslevel=5
+)
 
-def get_analyzer() -> ContractAnalyzer:
-    """Get or create the ContractAnalyzer instance."""
-    global analyzer
+def analyzer_dep(request: Request) -> ContractAnalyzer:
+    """Dependency returning the process-wide ContractAnalyzer."""
+    # Built here on first use when the runtime skipped the ASGI lifespan
+    analyzer = getattr(request.app.state, "analyzer", None)
+    if analyzer is None and API_KEY_CONFIGURED:
+        analyzer = request.app.state.analyzer = ContractAnalyzer(api_key=API_KEY)
     if analyzer is None:
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="GOOGLE_API_KEY not found in .env.local"
-            )
-        analyzer = ContractAnalyzer(api_key=api_key)
+        raise HTTPException(
+            status_code=500,
+            detail="GOOGLE_API_KEY not found in .env.local"
+        )
     return analyzer
 
 
+def gemini_semaphore(app: FastAPI) -> asyncio.Semaphore:
+    """The app's Gemini concurrency limit, created on first use without a lifespan."""
+    semaphore = getattr(app.state, "gemini_semaphore", None)
+    if semaphore is None:
+        semaphore = app.state.gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    return semaphore
+
+
+# Request batching: concurrent analyses are coalesced into one Gemini call
+MAX_BATCH = 8
+MAX_WAIT_MS = 30
+
+
+class BatchScheduler:
+    """Collects analysis requests for a short window and runs them as one batch."""
+    
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait_ms: int = MAX_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._analyzer: Optional[ContractAnalyzer] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Set[asyncio.Task] = set()
+    
+    def start(self, analyzer: Optional[ContractAnalyzer], semaphore: asyncio.Semaphore) -> None:
+        """Start the background worker on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done():
+            # A previous lifespan never stopped; don't leave its worker running
+            if self._loop is loop:
+                self._worker.cancel()
+            elif not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._worker.cancel)
+        self._analyzer = analyzer
+        self._semaphore = semaphore
+        self._queue = asyncio.Queue()
+        self._loop = loop
+        self._worker = loop.create_task(self._run())
+    
+    def _running(self) -> bool:
+        """True if the worker is alive on the running event loop."""
+        return (self._worker is not None and not self._worker.done()
+                and self._loop is asyncio.get_running_loop())
+    
+    async def stop(self) -> None:
+        """Stop the worker, let running batches finish and fail requests still queued."""
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+        
+        # Batches already sent to Gemini finish normally and resolve their requests
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        
+        queue, self._queue = self._queue, None
+        while queue is not None and not queue.empty():
+            _, future = queue.get_nowait()
+            self._fail(future)
+    
+    @staticmethod
+    def _fail(future: asyncio.Future) -> None:
+        """Fail a request that will never be dispatched."""
+        if not future.done():
+            future.set_exception(RuntimeError("Analysis service is shutting down."))
+    
+    async def submit(self, contract_text: str, analyzer: ContractAnalyzer,
+                     semaphore: asyncio.Semaphore) -> ContractAnalysisResult:
+        """Queue a contract for analysis and wait for its result."""
+        if not self._running():
+            # No lifespan on this loop (or it already shut down): start the worker here
+            self.start(analyzer, semaphore)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((contract_text, future))
+        return await future
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Stopped while collecting: these requests were taken off the queue
+                for _, future in batch:
+                    self._fail(future)
+                raise
+            
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        contract_analyzer = self._analyzer
+        
+        # Reject invalid contracts individually so they don't fail the batch, and
+        # send each distinct contract once (whitespace-insensitive, like the cache key)
+        pending: Dict[str, Tuple[str, List[asyncio.Future]]] = {}
+        for contract_text, future in batch:
+            if future.done():
+                continue
+            try:
+                contract_analyzer._validate_contract(contract_text)
+            except ValueError as e:
+                future.set_exception(e)
+                continue
+            normalized = contract_analyzer._normalize_text(contract_text)
+            pending.setdefault(normalized, (contract_text, []))[1].append(future)
+        
+        if not pending:
+            return
+        
+        try:
+            # The analyzer takes one permit per Gemini call it makes
+            results = await contract_analyzer.analyze_batch_async(
+                [text for text, _ in pending.values()], limiter=self._semaphore
+            )
+        except BaseException as e:
+            # Never leave a waiter hanging, including when the batch is cancelled
+            error = e if isinstance(e, Exception) else RuntimeError("Analysis was cancelled.")
+            for _, futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            if not isinstance(e, Exception):
+                raise
+            return
+        
+        for (_, futures), result in zip(pending.values(), results):
+            for i, future in enumerate(futures):
+                if not future.done():
+                    # Each waiter gets its own copy of a shared result
+                    future.set_result(result if i == 0 else copy.deepcopy(result))
+
+
+batch_scheduler = BatchScheduler()
+
+
 # Pydantic models for API
 class ContractInput(BaseModel):
     """Input model for contract analysis."""
-    contract_text: str
+    contract_text: Annotated[str, StringConstraints(max_length=ContractAnalyzer.MAX_CHARS)]
     
 class AnalysisMetadata(BaseModel):
     """Metadata about the analysis."""
@@ -64,535 +364,12 @@ class AnalysisResponse(BaseModel):
     metadata: AnalysisMetadata
 
 
-# HTML Template for the UI
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Legal Contract Analyzer</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            min-height: 100vh;
-            color: #fff;
-        }
-        
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        header {
-            text-align: center;
-            padding: 30px 0;
-            border-bottom: 1px solid rgba(255,255,255,0.1);
-            margin-bottom: 30px;
-        }
-        
-        h1 {
-            font-size: 2.5rem;
-            background: linear-gradient(90deg, #00d4ff, #7c3aed);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 10px;
-        }
-        
-        .subtitle {
-            color: #a0a0a0;
-            font-size: 1.1rem;
-        }
-        
-        .main-content {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 30px;
-        }
-        
-        @media (max-width: 1024px) {
-            .main-content {
-                grid-template-columns: 1fr;
-            }
-        }
-        
-        .input-section, .output-section {
-            background: rgba(255,255,255,0.05);
-            border-radius: 16px;
-            padding: 25px;
-            border: 1px solid rgba(255,255,255,0.1);
-        }
-        
-        .section-title {
-            font-size: 1.3rem;
-            margin-bottom: 20px;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        
-        .section-title .icon {
-            font-size: 1.5rem;
-        }
-        
-        textarea {
-            width: 100%;
-            height: 400px;
-            background: rgba(0,0,0,0.3);
-            border: 1px solid rgba(255,255,255,0.2);
-            border-radius: 12px;
-            padding: 15px;
-            color: #fff;
-            font-family: 'Consolas', monospace;
-            font-size: 0.95rem;
-            resize: vertical;
-            transition: border-color 0.3s;
-        }
-        
-        textarea:focus {
-            outline: none;
-            border-color: #00d4ff;
-        }
-        
-        textarea::placeholder {
-            color: #666;
-        }
-        
-        .btn-group {
-            display: flex;
-            gap: 15px;
-            margin-top: 20px;
-        }
-        
-        .btn {
-            padding: 14px 28px;
-            border: none;
-            border-radius: 10px;
-            font-size: 1rem;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        
-        .btn-primary {
-            background: linear-gradient(135deg, #00d4ff, #7c3aed);
-            color: #fff;
-        }
-        
-        .btn-primary:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 10px 30px rgba(0,212,255,0.3);
-        }
-        
-        .btn-primary:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-            transform: none;
-        }
-        
-        .btn-secondary {
-            background: rgba(255,255,255,0.1);
-            color: #fff;
-            border: 1px solid rgba(255,255,255,0.2);
-        }
-        
-        .btn-secondary:hover {
-            background: rgba(255,255,255,0.2);
-        }
-        
-        .output-section {
-            min-height: 500px;
-        }
-        
-        .tabs {
-            display: flex;
-            gap: 5px;
-            margin-bottom: 20px;
-            background: rgba(0,0,0,0.2);
-            padding: 5px;
-            border-radius: 10px;
-        }
-        
-        .tab {
-            padding: 12px 20px;
-            background: transparent;
-            border: none;
-            color: #a0a0a0;
-            cursor: pointer;
-            border-radius: 8px;
-            font-weight: 500;
-            transition: all 0.3s;
-        }
-        
-        .tab.active {
-            background: rgba(0,212,255,0.2);
-            color: #00d4ff;
-        }
-        
-        .tab:hover:not(.active) {
-            background: rgba(255,255,255,0.05);
-        }
-        
-        .tab-content {
-            display: none;
-            animation: fadeIn 0.3s;
-        }
-        
-        .tab-content.active {
-            display: block;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; }
-            to { opacity: 1; }
-        }
-        
-        .result-box {
-            background: rgba(0,0,0,0.3);
-            border-radius: 12px;
-            padding: 20px;
-            min-height: 350px;
-            max-height: 450px;
-            overflow-y: auto;
-        }
-        
-        .summary-text {
-            line-height: 1.8;
-            color: #e0e0e0;
-        }
-        
-        .clause-item {
-            background: rgba(255,255,255,0.05);
-            border-radius: 10px;
-            padding: 15px;
-            margin-bottom: 15px;
-            border-left: 4px solid #00d4ff;
-        }
-        
-        .clause-type {
-            font-weight: 600;
-            color: #00d4ff;
-            margin-bottom: 8px;
-            font-size: 0.9rem;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        .clause-text {
-            color: #c0c0c0;
-            line-height: 1.6;
-        }
-        
-        .risk-item {
-            background: rgba(255,87,87,0.1);
-            border-radius: 10px;
-            padding: 15px;
-            margin-bottom: 15px;
-            border-left: 4px solid #ff5757;
-        }
-        
-        .risk-clause {
-            color: #ff8a8a;
-            margin-bottom: 10px;
-            font-style: italic;
-        }
-        
-        .risk-reason {
-            color: #c0c0c0;
-            line-height: 1.6;
-        }
-        
-        .risk-label {
-            display: inline-block;
-            background: #ff5757;
-            color: #fff;
-            padding: 3px 10px;
-            border-radius: 5px;
-            font-size: 0.75rem;
-            font-weight: 600;
-            margin-bottom: 10px;
-        }
-        
-        .loading {
-            display: none;
-            text-align: center;
-            padding: 50px;
-        }
-        
-        .loading.active {
-            display: block;
-        }
-        
-        .spinner {
-            width: 50px;
-            height: 50px;
-            border: 4px solid rgba(255,255,255,0.1);
-            border-top-color: #00d4ff;
-            border-radius: 50%;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 20px;
-        }
-        
-        @keyframes spin {
-            to { transform: rotate(360deg); }
-        }
-        
-        .empty-state {
-            text-align: center;
-            padding: 50px;
-            color: #666;
-        }
-        
-        .empty-state .icon {
-            font-size: 4rem;
-            margin-bottom: 20px;
-        }
-        
-        .sample-contracts {
-            margin-top: 20px;
-        }
-        
-        .sample-btn {
-            padding: 8px 16px;
-            background: rgba(124,58,237,0.2);
-            border: 1px solid rgba(124,58,237,0.5);
-            border-radius: 8px;
-            color: #a78bfa;
-            cursor: pointer;
-            font-size: 0.85rem;
-            transition: all 0.3s;
-            margin-right: 10px;
-            margin-bottom: 10px;
-        }
-        
-        .sample-btn:hover {
-            background: rgba(124,58,237,0.4);
-        }
-        
-        .stats {
-            display: flex;
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        
-        .stat-item {
-            background: rgba(0,0,0,0.2);
-            padding: 15px 20px;
-            border-radius: 10px;
-            text-align: center;
-        }
-        
-        .stat-value {
-            font-size: 1.5rem;
-            font-weight: 700;
-            color: #00d4ff;
-        }
-        
-        .stat-label {
-            font-size: 0.8rem;
-            color: #888;
-            text-transform: uppercase;
-        }
-        
-        .json-output {
-            font-family: 'Consolas', monospace;
-            font-size: 0.85rem;
-            white-space: pre-wrap;
-            color: #a0e0a0;
-        }
-        
-        .error-message {
-            background: rgba(255,87,87,0.2);
-            border: 1px solid #ff5757;
-            border-radius: 10px;
-            padding: 20px;
-            color: #ff8a8a;
-            text-align: center;
-        }
-        
-        .metadata-banner {
-            display: flex;
-            gap: 20px;
-            align-items: center;
-            background: rgba(0,212,255,0.1);
-            border: 1px solid rgba(0,212,255,0.3);
-            border-radius: 10px;
-            padding: 12px 20px;
-            margin-bottom: 20px;
-        }
-        
-        .metadata-item {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        
-        .metadata-label {
-            color: #a0a0a0;
-            font-size: 0.9rem;
-        }
-        
-        .metadata-item span:last-child:not(.badge) {
-            color: #00d4ff;
-            font-weight: 600;
-        }
-        
-        .badge {
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 20px;
-            font-size: 0.75rem;
-            font-weight: 600;
-        }
-        
-        .badge-info {
-            background: rgba(124,58,237,0.3);
-            color: #b794f4;
-            border: 1px solid rgba(124,58,237,0.5);
-        }
-        
-        .badge-warning {
-            background: rgba(255,170,0,0.2);
-            color: #ffb347;
-            border: 1px solid rgba(255,170,0,0.4);
-        }
-        
-        .clause-not-found {
-            background: rgba(255,170,0,0.15);
-            border-left: 3px solid #ffaa00;
-        }
-        
-        .clause-not-found .clause-text {
-            color: #ffb347;
-            font-style: italic;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>⚖️ Legal Contract Analyzer</h1>
-            <p class="subtitle">AI-powered contract analysis using Gemini</p>
-        </header>
-        
-        <div class="main-content">
-            <div class="input-section">
-                <h2 class="section-title">
-                    <span class="icon">📄</span>
-                    Contract Input
-                </h2>
-                <textarea id="contractText" placeholder="Paste your legal contract here...
-
-Example:
-This agreement is between Company A and Company B. The payment for services rendered shall be made in two equal installments..."></textarea>
-                
-                <div class="btn-group">
-                    <button class="btn btn-primary" id="analyzeBtn" onclick="analyzeContract()">
-                        🔍 Analyze Contract
-                    </button>
-                    <button class="btn btn-secondary" onclick="clearAll()">
-                        🗑️ Clear
-                    </button>
-                </div>
-                
-                <div class="sample-contracts">
-                    <p style="color: #888; margin-bottom: 10px; font-size: 0.9rem;">Load sample contract:</p>
-                    <button class="sample-btn" onclick="loadSample('basic')">Basic Agreement</button>
-                    <button class="sample-btn" onclick="loadSample('complex')">Complex Contract</button>
-                    <button class="sample-btn" onclick="loadSample('risky')">Risky Contract</button>
-                </div>
-            </div>
-            
-            <div class="output-section">
-                <h2 class="section-title">
-                    <span class="icon">📊</span>
-                    Analysis Results
-                </h2>
-                
-                <div class="stats" id="stats" style="display: none;">
-                    <div class="stat-item">
-                        <div class="stat-value" id="clauseCount">0</div>
-                        <div class="stat-label">Clauses Found</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value" id="riskCount">0</div>
-                        <div class="stat-label">Risks Identified</div>
-                    </div>
-                </div>
-                
-                <div class="tabs">
-                    <button class="tab active" onclick="showTab('summary')">Summary</button>
-                    <button class="tab" onclick="showTab('clauses')">Clauses</button>
-                    <button class="tab" onclick="showTab('risks')">Risks</button>
-                    <button class="tab" onclick="showTab('json')">JSON</button>
-                </div>
-                
-                <div id="loading" class="loading">
-                    <div class="spinner"></div>
-                    <p>Analyzing contract with Gemini AI...</p>
-                </div>
-                
-                <div id="emptyState" class="empty-state">
-                    <div class="icon">📝</div>
-                    <p>Enter a contract and click "Analyze" to see results</p>
-                </div>
-                
-                <div id="errorState" class="error-message" style="display: none;"></div>
-                
-                <!-- Metadata Banner -->
-                <div id="metadataBanner" class="metadata-banner" style="display: none;">
-                    <div class="metadata-item">
-                        <span class="metadata-label">📝 Words:</span>
-                        <span id="wordCount">0</span>
-                    </div>
-                    <div class="metadata-item">
-                        <span class="metadata-label">🤖 Model:</span>
-                        <span id="modelUsed">-</span>
-                    </div>
-                    <div class="metadata-item" id="longContextBadge" style="display: none;">
-                        <span class="badge badge-info">Long Context Mode</span>
-                    </div>
-                </div>
-                
-                <div id="tab-summary" class="tab-content">
-                    <div class="result-box">
-                        <div id="summaryContent" class="summary-text"></div>
-                    </div>
-                </div>
-                
-                <div id="tab-clauses" class="tab-content">
-                    <div class="result-box" id="clausesContent"></div>
-                </div>
-                
-                <div id="tab-risks" class="tab-content">
-                    <div class="result-box" id="risksContent"></div>
-                </div>
-                
-                <div id="tab-json" class="tab-content">
-                    <div class="result-box">
-                        <pre id="jsonContent" class="json-output"></pre>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        const sampleContracts = {
-            basic: `This agreement is between Company A and Company B. The payment for services rendered shall be made in two equal installments, with the first payment due on January 1, 2026, and the second due upon completion of the project. Confidential information shared between the parties shall be kept confidential for a period of 5 years from the termination of this agreement. Either party may terminate this agreement with 30 days' notice. Dispute resolution will occur via binding arbitration in New York.`,
-            
-            complex: `SERVICE AGREEMENT
+# Sample contracts offered in the UI, fetched on demand from /api/sample/{name}
+SampleName = Literal["basic", "complex", "risky"]
+SAMPLE_CACHE_CONTROL: Final = "public, max-age=86400"
+SAMPLES: Final[Dict[str, bytes]] = {name: text.encode("utf-8") for name, text in {
+    "basic": """This agreement is between Company A and Company B. The payment for services rendered shall be made in two equal installments, with the first payment due on January 1, 2026, and the second due upon completion of the project. Confidential information shared between the parties shall be kept confidential for a period of 5 years from the termination of this agreement. Either party may terminate this agreement with 30 days' notice. Dispute resolution will occur via binding arbitration in New York.""",
+    "complex": """SERVICE AGREEMENT
 
 This Service Agreement ("Agreement") is entered into as of February 1, 2026, by and between TechCorp Inc. ("Service Provider") and GlobalEnterprises LLC ("Client").
 
@@ -611,9 +388,8 @@ Each party agrees to maintain the confidentiality of any proprietary information
 Either party may terminate this Agreement for cause with 15 days written notice if the other party materially breaches any provision and fails to cure such breach within the notice period.
 
 4. DISPUTE RESOLUTION
-Any disputes arising from this Agreement shall first be addressed through good faith negotiation. If negotiation fails, disputes shall be resolved through binding arbitration in San Francisco, California.`,
-            
-            risky: `CONSULTING AGREEMENT
+Any disputes arising from this Agreement shall first be addressed through good faith negotiation. If negotiation fails, disputes shall be resolved through binding arbitration in San Francisco, California.""",
+    "risky": """CONSULTING AGREEMENT
 
 This Agreement is made between ABC Consulting ("Consultant") and XYZ Corp ("Company").
 
@@ -633,176 +409,174 @@ INDEMNIFICATION
 The Consultant shall indemnify and hold harmless the Company from any and all claims, damages, and expenses, without limitation, arising from the Consultant's services.
 
 DISPUTE RESOLUTION
-Any disputes shall be resolved in a manner deemed appropriate by the Company.`
-        };
-        
-        function loadSample(type) {
-            document.getElementById('contractText').value = sampleContracts[type];
-        }
-        
-        function showTab(tabName) {
-            // Hide all tabs
-            document.querySelectorAll('.tab-content').forEach(tab => {
-                tab.classList.remove('active');
-            });
-            document.querySelectorAll('.tab').forEach(tab => {
-                tab.classList.remove('active');
-            });
-            
-            // Show selected tab
-            document.getElementById('tab-' + tabName).classList.add('active');
-            event.target.classList.add('active');
-        }
-        
-        function clearAll() {
-            document.getElementById('contractText').value = '';
-            document.getElementById('emptyState').style.display = 'block';
-            document.getElementById('stats').style.display = 'none';
-            document.getElementById('errorState').style.display = 'none';
-            document.getElementById('metadataBanner').style.display = 'none';
-            document.querySelectorAll('.tab-content').forEach(tab => {
-                tab.classList.remove('active');
-            });
-            document.getElementById('summaryContent').innerHTML = '';
-            document.getElementById('clausesContent').innerHTML = '';
-            document.getElementById('risksContent').innerHTML = '';
-            document.getElementById('jsonContent').textContent = '';
-        }
-        
-        async function analyzeContract() {
-            const contractText = document.getElementById('contractText').value.trim();
-            
-            if (!contractText) {
-                alert('Please enter a contract to analyze');
-                return;
-            }
-            
-            // Show loading
-            document.getElementById('loading').classList.add('active');
-            document.getElementById('emptyState').style.display = 'none';
-            document.getElementById('errorState').style.display = 'none';
-            document.getElementById('stats').style.display = 'none';
-            document.querySelectorAll('.tab-content').forEach(tab => {
-                tab.classList.remove('active');
-            });
-            document.getElementById('analyzeBtn').disabled = true;
-            
-            try {
-                const response = await fetch('/api/analyze', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ contract_text: contractText })
-                });
-                
-                if (!response.ok) {
-                    const error = await response.json();
-                    throw new Error(error.detail || 'Analysis failed');
-                }
-                
-                const result = await response.json();
-                displayResults(result);
-                
-            } catch (error) {
-                document.getElementById('loading').classList.remove('active');
-                document.getElementById('errorState').style.display = 'block';
-                document.getElementById('errorState').textContent = '❌ Error: ' + error.message;
-            } finally {
-                document.getElementById('analyzeBtn').disabled = false;
-            }
-        }
-        
-        function displayResults(result) {
-            // Hide loading
-            document.getElementById('loading').classList.remove('active');
-            
-            // Show metadata banner
-            if (result.metadata) {
-                document.getElementById('metadataBanner').style.display = 'flex';
-                document.getElementById('wordCount').textContent = result.metadata.word_count.toLocaleString();
-                document.getElementById('modelUsed').textContent = result.metadata.model_used;
-                
-                if (result.metadata.is_long_context) {
-                    document.getElementById('longContextBadge').style.display = 'block';
-                } else {
-                    document.getElementById('longContextBadge').style.display = 'none';
-                }
-            }
-            
-            // Show stats
-            document.getElementById('stats').style.display = 'flex';
-            
-            // Count only found clauses
-            const foundClauses = result.clauses.filter(c => c.clause !== 'Not found').length;
-            const notFoundClauses = result.clauses.filter(c => c.clause === 'Not found').length;
-            document.getElementById('clauseCount').textContent = foundClauses + (notFoundClauses > 0 ? ` (${notFoundClauses} not found)` : '');
-            document.getElementById('riskCount').textContent = result.risky_clauses.length;
-            
-            // Summary
-            document.getElementById('summaryContent').innerHTML = result.summary;
-            
-            // Clauses - with special handling for "Not found"
-            let clausesHtml = '';
-            if (result.clauses.length === 0) {
-                clausesHtml = '<p style="color: #888;">No clauses extracted</p>';
-            } else {
-                result.clauses.forEach(clause => {
-                    const isNotFound = clause.clause === 'Not found';
-                    const itemClass = isNotFound ? 'clause-item clause-not-found' : 'clause-item';
-                    const clauseText = isNotFound 
-                        ? '<em>⚠️ Not found in contract</em>' 
-                        : clause.clause;
-                    
-                    clausesHtml += `
-                        <div class="${itemClass}">
-                            <div class="clause-type">${clause.type}${isNotFound ? ' <span class="badge badge-warning">Missing</span>' : ''}</div>
-                            <div class="clause-text">${clauseText}</div>
-                        </div>
-                    `;
-                });
-            }
-            document.getElementById('clausesContent').innerHTML = clausesHtml;
-            
-            // Risks
-            let risksHtml = '';
-            if (result.risky_clauses.length === 0) {
-                risksHtml = '<p style="color: #4ade80;">✓ No significant risks identified</p>';
-            } else {
-                result.risky_clauses.forEach(risk => {
-                    risksHtml += `
-                        <div class="risk-item">
-                            <span class="risk-label">⚠️ RISK</span>
-                            <div class="risk-clause">"${risk.clause}"</div>
-                            <div class="risk-reason"><strong>Why it's risky:</strong> ${risk.reason}</div>
-                        </div>
-                    `;
-                });
-            }
-            document.getElementById('risksContent').innerHTML = risksHtml;
-            
-            // JSON
-            document.getElementById('jsonContent').textContent = JSON.stringify(result, null, 2);
-            
-            // Show summary tab
-            document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
-            document.querySelector('.tab').classList.add('active');
-            document.getElementById('tab-summary').classList.add('active');
-        }
-    </script>
-</body>
-</html>
-"""
+Any disputes shall be resolved in a manner deemed appropriate by the Company.""",
+}.items()}
+
+
+# UI assets live in static/; CSS and JS are served with a long cache TTL
+STATIC_DIR = Path(__file__).parent / "static"
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers and CDNs cache assets for a year."""
+    
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        return response
+
+
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+
+
+def _asset_url(name: str) -> str:
+    """URL of a static asset, versioned by content so cached copies never go stale."""
+    digest = hashlib.sha1((STATIC_DIR / name).read_bytes()).hexdigest()[:12]
+    return f"/static/{name}?v={digest}"
+
+
+def _render_index() -> str:
+    """Read the UI page and fill in asset versions."""
+    page = (STATIC_DIR / "index.html").read_text(encoding="utf-8")
+    for name in ("app.css", "app.js"):
+        page = page.replace(f'"/static/{name}"', f'"{_asset_url(name)}"')
+    return page
+
+
+# The UI is static, so render, encode and compress it once at import
+HTML_BYTES: Final[bytes] = _render_index().encode("utf-8")
+# Served at a fixed URL, so no "immutable": a reload must revalidate the ETag
+HTML_CACHE_CONTROL: Final = "public, max-age=3600"
+
+
+def _encoded_variant(body: bytes) -> Tuple[bytes, str]:
+    """Pair a response body with its ETag."""
+    return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+HTML_VARIANTS: Final[Dict[str, Tuple[bytes, str]]] = {
+    "identity": _encoded_variant(HTML_BYTES),
+    "gzip": _encoded_variant(gzip.compress(HTML_BYTES, 9)),
+}
+if brotli is not None:
+    HTML_VARIANTS["br"] = _encoded_variant(brotli.compress(HTML_BYTES, quality=11))
+
+
+def _pick_encoding(request: Request, available) -> str:
+    """Pick the best content encoding the client accepts."""
+    accept_encoding = request.headers.get("accept-encoding", "")
+    for encoding in ("br", "gzip"):
+        if encoding in available and encoding in accept_encoding:
+            return encoding
+    return "identity"
 
 
 @app.get("/", response_class=HTMLResponse)
-async def home():
+async def home(request: Request):
     """Serve the main UI."""
-    return HTML_TEMPLATE
+    encoding = _pick_encoding(request, HTML_VARIANTS)
+    body, etag = HTML_VARIANTS[encoding]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": HTML_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
+
+
+@app.get("/api/sample/{name}")
+async def get_sample(name: SampleName):
+    """Serve one of the UI's sample contracts as plain text."""
+    return Response(
+        content=SAMPLES[name],
+        media_type="text/plain; charset=utf-8",
+        headers={"Cache-Control": SAMPLE_CACHE_CONTROL}
+    )
+
+
+# Finished analyses keyed by SHA-256 of the contract text, stored as
+# (payload, {encoding: body}) so cache hits skip serialization and compression
+ANALYSIS_CACHE: TTLCache = TTLCache(maxsize=512, ttl=3600)
+
+# Analyses currently running, so identical concurrent requests share one call
+_inflight_analyses: Dict[bytes, asyncio.Task] = {}
+
+
+async def _single_flight_analysis(key: bytes, contract_text: str, analyzer: ContractAnalyzer,
+                                  semaphore: asyncio.Semaphore) -> ContractAnalysisResult:
+    """Analyze a contract, joining an identical analysis that is already running."""
+    task = _inflight_analyses.get(key)
+    if task is None:
+        task = asyncio.ensure_future(batch_scheduler.submit(contract_text, analyzer, semaphore))
+        _inflight_analyses[key] = task
+        task.add_done_callback(lambda _: _inflight_analyses.pop(key, None))
+    
+    # Shield so one client disconnecting doesn't cancel the call for the others
+    return await asyncio.shield(task)
+
+
+def _build_payload(contract_analyzer: ContractAnalyzer, contract_text: str,
+                   result: ContractAnalysisResult) -> Dict[str, Any]:
+    """Build the JSON body for an analysis, with word count and model metadata."""
+    word_count = contract_analyzer._get_word_count(contract_text)
+    is_long_context = word_count >= contract_analyzer.LONG_CONTRACT_THRESHOLD
+    model_used = contract_analyzer.LONG_CONTEXT_MODEL if is_long_context else contract_analyzer.DEFAULT_MODEL
+    
+    # Fields come straight from our own result, so skip pydantic validation
+    return {
+        "summary": result.summary,
+        "clauses": result.clauses,
+        "risky_clauses": result.risky_clauses,
+        "metadata": {
+            "word_count": word_count,
+            "model_used": model_used,
+            "is_long_context": is_long_context
+        }
+    }
+
+
+def _cache_analysis(key: bytes, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """Serialize and precompress an analysis payload, and cache it."""
+    body = orjson.dumps(payload)
+    bodies = {"identity": body}
+    if len(body) >= GZIP_MIN_SIZE:
+        bodies["gzip"] = gzip.compress(body, 5)
+        if brotli is not None:
+            bodies["br"] = brotli.compress(body, quality=4)
+    entry = (payload, bodies)
+    ANALYSIS_CACHE[key] = entry
+    return entry
+
+
+def _analysis_etag(key: bytes) -> str:
+    """ETag for an analysis: the quoted hex SHA-256 of the contract text."""
+    return '"' + key.hex() + '"'
+
+
+def _is_revalidation(request: Request, key: bytes) -> bool:
+    """True if the client already holds the analysis we still have cached."""
+    return _analysis_etag(key) in request.headers.get("if-none-match", "") and key in ANALYSIS_CACHE
+
+
+def _analysis_response(request: Request, key: bytes, bodies: Dict[str, bytes]) -> Response:
+    """Send a cached analysis in the best encoding the client accepts."""
+    encoding = _pick_encoding(request, bodies)
+    headers = {"Vary": "Accept-Encoding", "ETag": _analysis_etag(key)}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=bodies[encoding], media_type="application/json", headers=headers)
 
 
 @app.post("/api/analyze", response_model=AnalysisResponse)
-async def analyze_contract(input_data: ContractInput):
+async def analyze_contract(input_data: ContractInput, request: Request,
+                           contract_analyzer: ContractAnalyzer = Depends(analyzer_dep)):
     """
     Analyze a legal contract.
     
@@ -812,26 +586,22 @@ async def analyze_contract(input_data: ContractInput):
     Returns:
         AnalysisResponse with summary, clauses, risky clauses, and metadata
     """
+    key = hashlib.sha256(input_data.contract_text.encode("utf-8")).digest()
+    if _is_revalidation(request, key):
+        return Response(status_code=304, headers={"ETag": _analysis_etag(key)})
+    
+    cached = ANALYSIS_CACHE.get(key)
+    if cached is not None:
+        return _analysis_response(request, key, cached[1])
+    
     try:
-        contract_analyzer = get_analyzer()
-        
-        # Calculate word count and determine model
-        word_count = len(input_data.contract_text.split())
-        is_long_context = word_count >= contract_analyzer.LONG_CONTRACT_THRESHOLD
-        model_used = contract_analyzer.LONG_CONTEXT_MODEL if is_long_context else contract_analyzer.DEFAULT_MODEL
-        
-        result = contract_analyzer.analyze_efficient(input_data.contract_text)
-        
-        return AnalysisResponse(
-            summary=result.summary,
-            clauses=result.clauses,
-            risky_clauses=result.risky_clauses,
-            metadata=AnalysisMetadata(
-                word_count=word_count,
-                model_used=model_used,
-                is_long_context=is_long_context
-            )
+        result = await _single_flight_analysis(
+            key, input_data.contract_text, contract_analyzer, gemini_semaphore(request.app)
         )
+        
+        payload = _build_payload(contract_analyzer, input_data.contract_text, result)
+        _, bodies = _cache_analysis(key, payload)
+        return _analysis_response(request, key, bodies)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except RuntimeError as e:
@@ -840,18 +610,86 @@ async def analyze_contract(input_data: ContractInput):
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
-@app.get("/api/health")
+def _sse_event(data: Dict[str, Any]) -> bytes:
+    """Format one Server-Sent Event."""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/api/analyze/stream")
+async def analyze_contract_stream(input_data: ContractInput, request: Request,
+                                  contract_analyzer: ContractAnalyzer = Depends(analyzer_dep)):
+    """
+    Analyze a legal contract, streaming model output as Server-Sent Events.
+    
+    Emits {"type": "section", "section": ..., "value": ...} as each of summary,
+    clauses and risky_clauses completes, then a single {"type": "result",
+    "result": ...} event with the same payload /api/analyze returns, or
+    {"type": "error", "detail": ...}.
+    """
+    contract_text = input_data.contract_text
+    key = hashlib.sha256(contract_text.encode("utf-8")).digest()
+    if _is_revalidation(request, key):
+        return Response(status_code=304, headers={"ETag": _analysis_etag(key)})
+    
+    try:
+        contract_analyzer._validate_contract(contract_text)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def events():
+        cached = ANALYSIS_CACHE.get(key)
+        if cached is not None:
+            yield _sse_event({"type": "result", "result": cached[0]})
+            return
+        
+        try:
+            async with gemini_semaphore(request.app):
+                async for item in contract_analyzer.analyze_efficient_stream_async(contract_text):
+                    if isinstance(item, tuple):
+                        section, value = item
+                        yield _sse_event({"type": "section", "section": section, "value": value})
+                        continue
+                    
+                    payload = _build_payload(contract_analyzer, contract_text, item)
+                    _cache_analysis(key, payload)
+                    yield _sse_event({"type": "result", "result": payload})
+        except Exception as e:
+            yield _sse_event({"type": "error", "detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+# Nothing in the health response changes at runtime, so serialize it once
+HEALTH_BODY: Final[bytes] = orjson.dumps({
+    "status": "healthy",
+    "api_key_configured": API_KEY_CONFIGURED
+})
+
+
+@app.api_route("/api/health", methods=["GET", "HEAD"])
 async def health_check():
     """Health check endpoint."""
-    api_key = os.getenv("GOOGLE_API_KEY")
-    return {
-        "status": "healthy",
-        "api_key_configured": bool(api_key)
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
     import uvicorn
     print("Starting Legal Contract Analyzer API...")
     print("Open http://localhost:8000 in your browser")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Each worker builds its own analyzer, batch scheduler and cache
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2))
+    uvicorn.run(
+        "app:app",
+        app_dir=str(Path(__file__).parent),  # resolve "app:app" from any working directory
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        log_level="warning",
+        access_log=False
+    )
@@ -3,16 +3,28 @@ Legal Contract Analysis using Gemini AI.
 Summarizes contracts, extracts clauses, and identifies risks.
 """
 
+import asyncio
+import contextlib
+import copy
+import hashlib
 import os
 import json
+import math
 import re
 import sys
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+import threading
+import warnings
+from collections import OrderedDict, deque
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Any, Optional, Tuple
+from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 
 try:
     import google.generativeai as genai
+    from google.api_core import exceptions as google_exceptions, retry_async
 except ImportError:
     print("=" * 60)
     print("ERROR: Required package 'google-generativeai' not found!")
@@ -22,6 +34,30 @@ except ImportError:
     print("\nThen run this script again.")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional; falls back to the stdlib json module
+
+try:
+    import re2 as _linear_re  # google-re2: linear-time matching, no catastrophic backtracking
+except ImportError:
+    _linear_re = re  # Optional; the patterns below use only syntax both engines accept
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON, with orjson when available (its errors subclass json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to 2-space indented JSON, leaving non-ASCII characters as-is."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
 
 class ClauseType(Enum):
     """Clause types to extract."""
@@ -32,19 +68,19 @@ class ClauseType(Enum):
     OTHER = "Other"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExtractedClause:
     type: str
     clause: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskyClause:
     clause: str
     reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractAnalysisResult:
     """Complete analysis result for a contract."""
     summary: str
@@ -52,19 +88,302 @@ class ContractAnalysisResult:
     risky_clauses: List[Dict[str, str]]
     
     def to_json(self) -> str:
-        return json.dumps(asdict(self), indent=2, ensure_ascii=False)
+        return _json_dumps(self.to_dict())
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Fields are already JSON-native, so skip asdict()'s recursive copy (lists are shared)
+        return {
+            "summary": self.summary,
+            "clauses": self.clauses,
+            "risky_clauses": self.risky_clauses
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContractAnalysisResult":
+        return cls(
+            summary=data["summary"],
+            clauses=data["clauses"],
+            risky_clauses=data["risky_clauses"]
+        )
     
     def get_summary_json(self) -> str:
-        return json.dumps({"summary": self.summary}, indent=2)
+        return _json_dumps({"summary": self.summary})
     
     def get_clauses_json(self) -> str:
-        return json.dumps({"clauses": self.clauses}, indent=2)
+        return _json_dumps({"clauses": self.clauses})
     
     def get_risks_json(self) -> str:
-        return json.dumps({"risky_clauses": self.risky_clauses}, indent=2)
+        return _json_dumps({"risky_clauses": self.risky_clauses})
+
+
+# Whitespace runs, collapsed for cache keys and embeddings in one pass
+_WS_RE = re.compile(r"\s+")
+
+# Markdown code fence around a model's JSON answer (only older or unconstrained replies)
+_CODEFENCE_RE = _linear_re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+
+
+class _SectionScanner:
+    """Pick completed top-level values out of a JSON object as it streams in."""
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start = 0
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk; return (key, value) for each top-level value it completed."""
+        self.text += chunk
+        text = self.text
+        completed = []
+        
+        # Resume where the last chunk stopped, so the whole reply is scanned once
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._value_start is None:
+                        self._key = json.loads(text[self._key_start:i + 1])
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = i
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0 and self._value_start is not None:
+                    completed += self._finish(i)
+            elif ch == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = i + 1
+            elif ch == "," and self._depth == 1 and self._value_start is not None:
+                completed += self._finish(i)
+        
+        self._pos = len(text)
+        return completed
+    
+    def _finish(self, end: int) -> List[Tuple[str, Any]]:
+        """Decode the value that ends at `end`; skip it if it isn't valid JSON."""
+        raw = self.text[self._value_start:end]
+        self._value_start = None
+        try:
+            return [(self._key, _json_loads(raw))]
+        except json.JSONDecodeError:
+            return []
+
+
+def _object_schema(**properties: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON schema for an object whose listed properties are all required."""
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+
+def _json_output(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Generation config that makes Gemini answer with JSON matching `schema`."""
+    return {"response_mime_type": "application/json", "response_schema": schema}
+
+
+_STRING = {"type": "string"}
+_CLAUSE_SCHEMA = _object_schema(type=_STRING, clause=_STRING)
+_RISK_SCHEMA = _object_schema(clause=_STRING, reason=_STRING)
+_ANALYSIS_SCHEMA = _object_schema(
+    summary=_STRING,
+    clauses={"type": "array", "items": _CLAUSE_SCHEMA},
+    risky_clauses={"type": "array", "items": _RISK_SCHEMA}
+)
+
+# Structured output: replies are bare JSON, so parsing succeeds on the first json.loads
+SUMMARY_GENERATION_CONFIG = _json_output(_object_schema(summary=_STRING))
+CLAUSES_GENERATION_CONFIG = _json_output(
+    _object_schema(clauses={"type": "array", "items": _CLAUSE_SCHEMA})
+)
+RISKS_GENERATION_CONFIG = _json_output(
+    _object_schema(risky_clauses={"type": "array", "items": _RISK_SCHEMA})
+)
+ANALYSIS_GENERATION_CONFIG = _json_output(_ANALYSIS_SCHEMA)
+BATCH_GENERATION_CONFIG = _json_output(
+    _object_schema(analyses={"type": "array", "items": _ANALYSIS_SCHEMA})
+)
+
+
+# Prompt templates; the contract text is substituted for $contract on each call
+SUMMARY_PROMPT = """You are a legal contract analyst. Analyze the following contract and provide a concise summary.
+
+Focus on these key elements:
+- Payment terms and conditions
+- Confidentiality requirements
+- Termination conditions
+- Dispute resolution mechanisms
+- Any other critical terms
+
+Contract:
+$contract
+
+Provide your response as a JSON object with this exact structure:
+{"summary": "Your concise summary here"}
+
+Keep the summary clear, professional, and under 200 words."""
+
+CLAUSES_PROMPT = """You are a legal contract analyst. Extract and classify the following types of clauses from this contract:
+
+1. Payment Terms: Terms related to payments, deadlines, penalties, amounts, installments
+2. Confidentiality: Terms defining confidentiality, its duration, and restrictions
+3. Dispute Resolution: How disputes will be resolved (arbitration, litigation, mediation)
+4. Termination: Conditions under which the contract can be terminated
+
+Contract:
+$contract
+
+Provide your response as a JSON object with this exact structure:
+{
+  "clauses": [
+    {"type": "Payment Terms", "clause": "exact text from contract OR 'Not found' if not present"},
+    {"type": "Confidentiality", "clause": "exact text from contract OR 'Not found' if not present"},
+    {"type": "Dispute Resolution", "clause": "exact text from contract OR 'Not found' if not present"},
+    {"type": "Termination", "clause": "exact text from contract OR 'Not found' if not present"}
+  ]
+}
+
+CRITICAL INSTRUCTIONS:
+- Extract the EXACT text from the contract for each clause
+- If a clause type is NOT found in the contract, you MUST include it with "clause": "Not found"
+- DO NOT hallucinate or invent clauses that don't exist in the contract
+- ALL FOUR clause types must appear in the output
+- You may include multiple clauses of the same type if present"""
+
+RISKS_PROMPT = """You are a legal risk analyst. Analyze this contract and identify risky or ambiguous clauses.
+
+Look for these risk categories:
+
+1. VAGUE LANGUAGE: Terms like $sample_indicators
+2. ONE-SIDED TERMS: Clauses heavily favoring one party
+3. MISSING SPECIFICS: Undefined deadlines, unclear conditions, missing amounts
+4. AMBIGUOUS CRITERIA: Unclear completion milestones or performance standards
+5. LACK OF REMEDIES: No specified penalties or resolution for breaches
+6. OPEN-ENDED OBLIGATIONS: Unlimited duration or scope
+7. SUBJECTIVE STANDARDS: Terms requiring interpretation
+8. MISSING CLAUSES: Important protections that should be present but aren't
+
+Contract:
+$contract
+
+Provide your response as a JSON object:
+{
+  "risky_clauses": [
+    {
+      "clause": "exact risky clause text from contract",
+      "reason": "detailed explanation of the legal risk and potential consequences"
+    }
+  ]
+}
+
+RULES:
+- Extract EXACT text from the contract for each risky clause
+- Provide SPECIFIC explanations of why each clause is risky
+- Consider legal implications and dispute potential
+- If no risky clauses found, return empty array: {"risky_clauses": []}"""
+
+# The single-call analysis sends its fixed instructions as the system instruction,
+# so every request shares the same prefix and only the contract varies
+EFFICIENT_SYSTEM_INSTRUCTION = """You are an expert legal contract analyst. Perform a comprehensive analysis of the contract you are given.
+
+Provide your analysis as a JSON object with this EXACT structure:
+{
+  "summary": "A concise summary (under 200 words) covering payment terms, confidentiality, termination, and dispute resolution",
+  "clauses": [
+    {"type": "Payment Terms", "clause": "exact text OR 'Not found'"},
+    {"type": "Confidentiality", "clause": "exact text OR 'Not found'"},
+    {"type": "Dispute Resolution", "clause": "exact text OR 'Not found'"},
+    {"type": "Termination", "clause": "exact text OR 'Not found'"}
+  ],
+  "risky_clauses": [
+    {
+      "clause": "exact risky clause text",
+      "reason": "detailed explanation of the risk"
+    }
+  ]
+}
+
+CRITICAL INSTRUCTIONS:
+
+1. SUMMARY:
+   - Focus on key business terms
+   - Keep under 200 words
+   - Be professional and clear
+
+2. CLAUSES:
+   - Extract EXACT text from the contract
+   - If a clause type is NOT present, use "Not found"
+   - DO NOT invent clauses - only extract what exists
+   - ALL FOUR types MUST appear in output
+
+3. RISKS:
+   - Look for vague terms like: $sample_indicators
+   - Flag one-sided or ambiguous clauses
+   - Explain WHY each clause is risky
+   - Consider legal disputes and enforcement issues
+   - If no risks found, use empty array
+
+Return ONLY valid JSON, no additional text."""
+
+EFFICIENT_PROMPT = """Contract:
+$contract"""
+
+BATCH_PROMPT = """You are an expert legal contract analyst. Perform a comprehensive analysis of each of the $count contracts below. Analyze every contract independently of the others.
+
+$contracts
+
+Provide your analysis as a JSON object with this EXACT structure, with exactly one entry in "analyses" per contract, in the same order as the contracts:
+{
+  "analyses": [
+    {
+      "summary": "A concise summary (under 200 words) covering payment terms, confidentiality, termination, and dispute resolution",
+      "clauses": [
+        {"type": "Payment Terms", "clause": "exact text OR 'Not found'"},
+        {"type": "Confidentiality", "clause": "exact text OR 'Not found'"},
+        {"type": "Dispute Resolution", "clause": "exact text OR 'Not found'"},
+        {"type": "Termination", "clause": "exact text OR 'Not found'"}
+      ],
+      "risky_clauses": [
+        {
+          "clause": "exact risky clause text",
+          "reason": "detailed explanation of the risk"
+        }
+      ]
+    }
+  ]
+}
+
+CRITICAL INSTRUCTIONS:
+
+1. SUMMARY:
+   - Focus on key business terms
+   - Keep under 200 words
+   - Be professional and clear
+
+2. CLAUSES:
+   - Extract EXACT text from the contract being analyzed
+   - If a clause type is NOT present, use "Not found"
+   - DO NOT invent clauses or copy text from a different contract
+   - ALL FOUR types MUST appear in every analysis
+
+3. RISKS:
+   - Look for vague terms like: $sample_indicators
+   - Flag one-sided or ambiguous clauses
+   - Explain WHY each clause is risky
+   - Consider legal disputes and enforcement issues
+   - If no risks found, use empty array
+
+Return ONLY valid JSON, no additional text."""
 
 
 class ContractAnalyzer:
@@ -74,6 +393,25 @@ class ContractAnalyzer:
     LONG_CONTEXT_MODEL = "gemini-3-pro-preview"
     LONG_CONTRACT_THRESHOLD = 3500
     MAX_WORDS = 5000
+    MAX_CHARS = MAX_WORDS * 40  # Ample for MAX_WORDS of real text; longer input is rejected before splitting
+    MAX_BATCH_SIZE = 100
+    WORD_COUNT_CHUNK = 8192
+    RESPONSE_CACHE_SIZE = 256  # Parsed results kept per analyzer; 0 disables caching
+    
+    # Optional near-duplicate lookup for single-call analysis (see use_semantic_cache)
+    EMBEDDING_MODEL = "models/text-embedding-004"
+    SEMANTIC_CACHE_THRESHOLD = 0.95  # Minimum cosine similarity to reuse a cached analysis
+    
+    # Async calls back off and retry when Gemini rate-limits us (HTTP 429)
+    ASYNC_REQUEST_OPTIONS = {
+        "retry": retry_async.AsyncRetry(
+            predicate=retry_async.if_exception_type(google_exceptions.ResourceExhausted),
+            initial=1.0,
+            maximum=30.0,
+            multiplier=2.0,
+            timeout=120.0
+        )
+    }
     
     REQUIRED_CLAUSE_TYPES = [
         "Payment Terms",
@@ -114,7 +452,17 @@ class ContractAnalyzer:
         "indemnify and hold harmless",
     ]
     
-    def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None):
+    # All indicators in one pass; longest first so "best efforts" wins over "best effort"
+    RISK_INDICATOR_RE = _linear_re.compile(
+        "(?i)" + "|".join(re.escape(ind) for ind in sorted(RISK_INDICATORS, key=len, reverse=True))
+    )
+    
+    # Quoted examples for the prompts; RISK_INDICATORS is fixed, so build them once per class
+    _LONG_SAMPLE_INDICATORS = ", ".join(f'"{ind}"' for ind in RISK_INDICATORS[:8])
+    _SHORT_SAMPLE_INDICATORS = ", ".join(f'"{ind}"' for ind in RISK_INDICATORS[:6])
+    
+    def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None,
+                 use_semantic_cache: bool = False):
         """Initialize with API key (or uses GOOGLE_API_KEY env var)."""
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         
@@ -129,32 +477,103 @@ class ContractAnalyzer:
         
         # Store custom model name if provided
         self._custom_model_name = model_name
-        
-        # Initialize models for dynamic selection
-        self.default_model = genai.GenerativeModel(self.DEFAULT_MODEL)
-        self.long_context_model = genai.GenerativeModel(self.LONG_CONTEXT_MODEL)
+        self._model_cache: Dict[tuple, tuple] = {}
         
         self.max_words = self.MAX_WORDS
+        
+        # Parsed results keyed by SHA-256 of task, model and contract text (LRU)
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Opt-in: near-identical contracts (e.g. one template with other party names)
+        # reuse an earlier analysis, which may then mention the wrong parties or dates
+        self.use_semantic_cache = use_semantic_cache
+        self._semantic_cache: deque = deque(maxlen=max(self.RESPONSE_CACHE_SIZE, 0))
+        
+        # Prompts are static apart from the contract text, so prepare them once
+        self._summary_prompt = Template(SUMMARY_PROMPT)
+        self._clauses_prompt = Template(CLAUSES_PROMPT)
+        self._risks_prompt = Template(
+            Template(RISKS_PROMPT).safe_substitute(sample_indicators=self._LONG_SAMPLE_INDICATORS)
+        )
+        self._efficient_instruction = Template(EFFICIENT_SYSTEM_INSTRUCTION).substitute(
+            sample_indicators=self._SHORT_SAMPLE_INDICATORS
+        )
+        self._efficient_prompt = Template(EFFICIENT_PROMPT)
+        self._efficient_models: Dict[str, Any] = {}
+        self._batch_prompt = Template(
+            Template(BATCH_PROMPT).safe_substitute(sample_indicators=self._SHORT_SAMPLE_INDICATORS)
+        )
     
     def _get_word_count(self, text: str) -> int:
-        return len(text.split())
+        """Count whitespace-separated words without building one list of every token."""
+        # Splitting fixed-size slices keeps each throwaway list small and cache-friendly
+        count = 0
+        prev_is_space = True
+        for start in range(0, len(text), self.WORD_COUNT_CHUNK):
+            chunk = text[start:start + self.WORD_COUNT_CHUNK]
+            count += len(chunk.split())
+            # A word straddling the slice boundary was counted once on each side
+            if not prev_is_space and not chunk[0].isspace():
+                count -= 1
+            prev_is_space = chunk[-1].isspace()
+        return count
+    
+    # Models are built on first use; most contracts never need the long-context one
+    @cached_property
+    def default_model(self):
+        """Model for contracts under the long-contract threshold."""
+        return genai.GenerativeModel(self.DEFAULT_MODEL)
+    
+    @cached_property
+    def long_context_model(self):
+        """Model for contracts at or over the long-contract threshold."""
+        return genai.GenerativeModel(self.LONG_CONTEXT_MODEL)
     
-    def _get_model_for_contract(self, contract_text: str) -> tuple:
-        """Select model based on contract length."""
+    @cached_property
+    def custom_model(self):
+        """Model named by the caller, used for every contract."""
+        return genai.GenerativeModel(self._custom_model_name)
+    
+    def _get_model_name_for_contract(self, word_count: int) -> str:
+        """Select model name based on contract length in words."""
         if self._custom_model_name:
-            return genai.GenerativeModel(self._custom_model_name), self._custom_model_name
-        
-        word_count = self._get_word_count(contract_text)
+            return self._custom_model_name
         
         if word_count >= self.LONG_CONTRACT_THRESHOLD:
-            return self.long_context_model, self.LONG_CONTEXT_MODEL
-        else:
-            return self.default_model, self.DEFAULT_MODEL
+            return self.LONG_CONTEXT_MODEL
+        return self.DEFAULT_MODEL
     
-    def _validate_contract(self, contract_text: str) -> int:
-        """Validate contract and return word count."""
+    def _get_model_for_contract(self, word_count: int) -> tuple:
+        """Select model based on contract length in words."""
+        # The choice only depends on the threshold side, so there are at most two entries
+        key = (word_count >= self.LONG_CONTRACT_THRESHOLD, self._custom_model_name)
+        selected = self._model_cache.get(key)
+        if selected is None:
+            if self._custom_model_name:
+                selected = (self.custom_model, self._custom_model_name)
+            elif key[0]:
+                selected = (self.long_context_model, self.LONG_CONTEXT_MODEL)
+            else:
+                selected = (self.default_model, self.DEFAULT_MODEL)
+            self._model_cache[key] = selected
+        return selected
+    
+    @staticmethod
+    def _validate_input(contract_text: str) -> None:
+        """Reject empty or whitespace-only contracts (needs no client or API call)."""
         if not contract_text or not contract_text.strip():
             raise ValueError("Contract text cannot be empty.")
+    
+    def _validate_contract(self, contract_text: str) -> int:
+        """Validate contract and return word count."""
+        self._validate_input(contract_text)
+        
+        if len(contract_text) > self.MAX_CHARS:
+            raise ValueError(
+                f"Contract exceeds maximum length of {self.MAX_CHARS} characters. "
+                f"Please reduce the contract length and try again."
+            )
         
         word_count = self._get_word_count(contract_text)
         
@@ -167,30 +586,114 @@ class ContractAnalyzer:
         
         return word_count
     
+    @staticmethod
+    def _normalize_text(contract_text: str) -> str:
+        """Collapse whitespace so re-pasted copies of a contract compare equal."""
+        # One regex pass builds the result directly, with no list of every token
+        return _WS_RE.sub(" ", contract_text).strip()
+    
+    def _cache_key(self, task: str, model, normalized: str) -> str:
+        """Content-addressed cache key for one task on one normalized contract."""
+        return hashlib.sha256(f"{task}|{model.model_name}|{normalized}".encode("utf-8")).hexdigest()
+    
+    def _cache_get(self, key: str) -> Any:
+        """Return a copy of a cached result, or None."""
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is None:
+                return None
+            self._cache.move_to_end(key)
+        return copy.deepcopy(value)
+    
+    def _cache_put(self, key: str, value: Any) -> None:
+        """Cache a copy of a result, evicting the least recently used entry."""
+        if self.RESPONSE_CACHE_SIZE <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = copy.deepcopy(value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _normalize_embedding(self, values: List[float]) -> List[float]:
+        """Scale an embedding to unit length so a dot product is the cosine similarity."""
+        norm = math.sqrt(sum(v * v for v in values)) or 1.0
+        return [v / norm for v in values]
+    
+    def _embed_contract(self, normalized: str) -> Optional[List[float]]:
+        """Embed a contract for the semantic cache; None if disabled or the call fails."""
+        if not self.use_semantic_cache:
+            return None
+        try:
+            response = genai.embed_content(
+                model=self.EMBEDDING_MODEL,
+                content=normalized,
+                task_type="semantic_similarity"
+            )
+        except Exception:
+            return None  # A missed lookup must never fail the analysis itself
+        return self._normalize_embedding(response["embedding"])
+    
+    async def _embed_contract_async(self, normalized: str) -> Optional[List[float]]:
+        """Async version of _embed_contract()."""
+        if not self.use_semantic_cache:
+            return None
+        try:
+            response = await genai.embed_content_async(
+                model=self.EMBEDDING_MODEL,
+                content=normalized,
+                task_type="semantic_similarity"
+            )
+        except Exception:
+            return None
+        return self._normalize_embedding(response["embedding"])
+    
+    def _semantic_get(self, model_name: str, embedding: Optional[List[float]]) -> Any:
+        """Return a copy of the most similar cached analysis above the threshold, or None."""
+        if embedding is None:
+            return None
+        # Snapshot under the lock and scan outside it, so writers aren't held up
+        with self._cache_lock:
+            entries = [entry for entry in self._semantic_cache if entry[0] == model_name]
+        best, best_similarity = None, self.SEMANTIC_CACHE_THRESHOLD
+        for _, cached_embedding, result in entries:
+            similarity = sum(a * b for a, b in zip(cached_embedding, embedding))
+            if similarity >= best_similarity:
+                best, best_similarity = result, similarity
+        return copy.deepcopy(best)
+    
+    def _semantic_put(self, model_name: str, embedding: Optional[List[float]], result: Any) -> None:
+        """Remember an analysis under its contract embedding, dropping the oldest when full."""
+        if embedding is None:
+            return
+        with self._cache_lock:
+            self._semantic_cache.append((model_name, embedding, copy.deepcopy(result)))
+    
     def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
         """Parse JSON from model response, handling markdown code blocks."""
         text = response_text.strip()
         
         # Try direct parse first
         try:
-            return json.loads(text)
+            return _json_loads(text)
         except json.JSONDecodeError:
             pass
         
         # Handle ```json ... ``` format
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
+        json_match = _CODEFENCE_RE.search(text)
         if json_match:
             text = json_match.group(1).strip()
             try:
-                return json.loads(text)
+                return _json_loads(text)
             except json.JSONDecodeError:
                 pass
         
-        # Try to find JSON object
-        json_pattern = re.search(r'(\{[\s\S]*\})', text)
-        if json_pattern:
+        # Try to find JSON object: first "{" through last "}", found without regex backtracking
+        start = text.find("{")
+        end = text.rfind("}")
+        if start != -1 and end > start:
             try:
-                return json.loads(json_pattern.group(1))
+                return _json_loads(text[start:end + 1])
             except json.JSONDecodeError:
                 pass
         
@@ -199,149 +702,213 @@ class ContractAnalyzer:
     
     def _ensure_all_clause_types(self, clauses: List[Dict[str, str]]) -> List[Dict[str, str]]:
         """Ensure all required clause types are present (adds 'Not found' for missing)."""
-        found_types = {clause.get("type") for clause in clauses}
-        result = list(clauses)
+        # Bucket clauses by required type in one pass; equivalent to a stable sort by type
+        grouped: Dict[str, List[Dict[str, str]]] = {t: [] for t in self.REQUIRED_CLAUSE_TYPES}
+        extras = []
+        for clause in clauses:
+            grouped.get(clause.get("type"), extras).append(clause)
         
-        for clause_type in self.REQUIRED_CLAUSE_TYPES:
-            if clause_type not in found_types:
-                result.append({
-                    "type": clause_type,
-                    "clause": "Not found"
-                })
-        
-        type_order = {t: i for i, t in enumerate(self.REQUIRED_CLAUSE_TYPES)}
-        result.sort(key=lambda x: type_order.get(x.get("type"), 999))
+        result = []
+        for clause_type, found in grouped.items():
+            result.extend(found or [{"type": clause_type, "clause": "Not found"}])
+        result.extend(extras)
         
         return result
     
-    def summarize_contract(self, contract_text: str) -> str:
-        """Generate a concise summary of the contract."""
-        self._validate_contract(contract_text)
-        model, _ = self._get_model_for_contract(contract_text)
-        
-        prompt = f"""You are a legal contract analyst. Analyze the following contract and provide a concise summary.
-
-Focus on these key elements:
-- Payment terms and conditions
-- Confidentiality requirements
-- Termination conditions
-- Dispute resolution mechanisms
-- Any other critical terms
-
-Contract:
-{contract_text}
-
-Provide your response as a JSON object with this exact structure:
-{{"summary": "Your concise summary here"}}
+    def _build_summary_prompt(self, contract_text: str) -> str:
+        """Build the prompt for summarize_contract()."""
+        return self._summary_prompt.substitute(contract=contract_text)
+    
+    def _build_clauses_prompt(self, contract_text: str) -> str:
+        """Build the prompt for extract_clauses()."""
+        return self._clauses_prompt.substitute(contract=contract_text)
+    
+    def _build_risks_prompt(self, contract_text: str) -> str:
+        """Build the prompt for identify_risks()."""
+        return self._risks_prompt.substitute(contract=contract_text)
 
-Keep the summary clear, professional, and under 200 words."""
-        
+    def _parse_summary(self, response_text: str) -> str:
+        """Pull the summary out of a summarize response."""
         try:
-            response = model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            result = self._parse_json_response(response_text)
             return result.get("summary", "Unable to generate summary.")
         except json.JSONDecodeError:
             # If JSON parsing fails, return the raw text cleaned up
-            return response.text.strip()
-        except Exception as e:
-            raise RuntimeError(f"Error generating summary: {str(e)}")
+            return response_text.strip()
     
-    def extract_clauses(self, contract_text: str) -> List[Dict[str, str]]:
-        """Extract and classify clauses from the contract."""
-        self._validate_contract(contract_text)
-        model, _ = self._get_model_for_contract(contract_text)
-        
-        prompt = f"""You are a legal contract analyst. Extract and classify the following types of clauses from this contract:
-
-1. Payment Terms: Terms related to payments, deadlines, penalties, amounts, installments
-2. Confidentiality: Terms defining confidentiality, its duration, and restrictions
-3. Dispute Resolution: How disputes will be resolved (arbitration, litigation, mediation)
-4. Termination: Conditions under which the contract can be terminated
-
-Contract:
-{contract_text}
-
-Provide your response as a JSON object with this exact structure:
-{{
-  "clauses": [
-    {{"type": "Payment Terms", "clause": "exact text from contract OR 'Not found' if not present"}},
-    {{"type": "Confidentiality", "clause": "exact text from contract OR 'Not found' if not present"}},
-    {{"type": "Dispute Resolution", "clause": "exact text from contract OR 'Not found' if not present"}},
-    {{"type": "Termination", "clause": "exact text from contract OR 'Not found' if not present"}}
-  ]
-}}
-
-CRITICAL INSTRUCTIONS:
-- Extract the EXACT text from the contract for each clause
-- If a clause type is NOT found in the contract, you MUST include it with "clause": "Not found"
-- DO NOT hallucinate or invent clauses that don't exist in the contract
-- ALL FOUR clause types must appear in the output
-- You may include multiple clauses of the same type if present"""
-        
+    def _parse_clauses(self, response_text: str) -> List[Dict[str, str]]:
+        """Pull the clause list out of an extract_clauses response."""
         try:
-            response = model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            result = self._parse_json_response(response_text)
             clauses = result.get("clauses", [])
             return self._ensure_all_clause_types(clauses)
         except json.JSONDecodeError:
             return [{"type": t, "clause": "Not found"} for t in self.REQUIRED_CLAUSE_TYPES]
-        except Exception as e:
-            raise RuntimeError(f"Error extracting clauses: {str(e)}")
     
-    def identify_risks(self, contract_text: str) -> List[Dict[str, str]]:
-        """Identify risky or ambiguous clauses."""
-        self._validate_contract(contract_text)
-        model, _ = self._get_model_for_contract(contract_text)
-        sample_indicators = ", ".join(f'"{ind}"' for ind in self.RISK_INDICATORS[:8])
-        
-        prompt = f"""You are a legal risk analyst. Analyze this contract and identify risky or ambiguous clauses.
-
-Look for these risk categories:
-
-1. VAGUE LANGUAGE: Terms like {sample_indicators}
-2. ONE-SIDED TERMS: Clauses heavily favoring one party
-3. MISSING SPECIFICS: Undefined deadlines, unclear conditions, missing amounts
-4. AMBIGUOUS CRITERIA: Unclear completion milestones or performance standards
-5. LACK OF REMEDIES: No specified penalties or resolution for breaches
-6. OPEN-ENDED OBLIGATIONS: Unlimited duration or scope
-7. SUBJECTIVE STANDARDS: Terms requiring interpretation
-8. MISSING CLAUSES: Important protections that should be present but aren't
-
-Contract:
-{contract_text}
-
-Provide your response as a JSON object:
-{{
-  "risky_clauses": [
-    {{
-      "clause": "exact risky clause text from contract",
-      "reason": "detailed explanation of the legal risk and potential consequences"
-    }}
-  ]
-}}
-
-RULES:
-- Extract EXACT text from the contract for each risky clause
-- Provide SPECIFIC explanations of why each clause is risky
-- Consider legal implications and dispute potential
-- If no risky clauses found, return empty array: {{"risky_clauses": []}}"""
-        
+    def _parse_risks(self, response_text: str) -> List[Dict[str, str]]:
+        """Pull the risky clause list out of an identify_risks response."""
         try:
-            response = model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            result = self._parse_json_response(response_text)
             return result.get("risky_clauses", [])
         except json.JSONDecodeError:
             return []
+    
+    def _lookup(self, task: str, model, normalized: str) -> Tuple[str, Any]:
+        """Return the cache key for a task on a normalized contract, and its cached result or None."""
+        key = self._cache_key(task, model, normalized)
+        return key, self._cache_get(key)
+    
+    def _generate(self, key: str, model, prompt: str, config: Optional[Dict[str, Any]],
+                  parse: Callable[[str], Any], label: str) -> Any:
+        """Make one Gemini call, parse the reply and cache it under `key`."""
+        try:
+            response = model.generate_content(prompt, generation_config=config)
+            result = parse(response.text)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Failed to parse model response: {str(e)}")
         except Exception as e:
-            raise RuntimeError(f"Error identifying risks: {str(e)}")
+            raise RuntimeError(f"{label}: {str(e)}")
+        
+        self._cache_put(key, result)
+        return result
+    
+    async def _generate_async(self, key: str, model, prompt: str, config: Optional[Dict[str, Any]],
+                              parse: Callable[[str], Any], label: str) -> Any:
+        """Async version of _generate() using the SDK's native async client."""
+        try:
+            response = await model.generate_content_async(
+                prompt, generation_config=config, request_options=self.ASYNC_REQUEST_OPTIONS
+            )
+            result = parse(response.text)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Failed to parse model response: {str(e)}")
+        except Exception as e:
+            raise RuntimeError(f"{label}: {str(e)}")
+        
+        self._cache_put(key, result)
+        return result
+    
+    def summarize_contract(self, contract_text: str) -> str:
+        """Generate a concise summary of the contract."""
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
+        return self._summarize(model, contract_text)
+    
+    async def summarize_async(self, contract_text: str) -> str:
+        """Async version of summarize_contract()."""
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
+        return await self._summarize_async(model, contract_text)
+    
+    def _summarize(self, model, contract_text: str) -> str:
+        key, cached = self._lookup("summary", model, self._normalize_text(contract_text))
+        if cached is not None:
+            return cached
+        return self._generate(key, model, self._build_summary_prompt(contract_text),
+                              SUMMARY_GENERATION_CONFIG, self._parse_summary, "Error generating summary")
+    
+    async def _summarize_async(self, model, contract_text: str) -> str:
+        key, cached = self._lookup("summary", model, self._normalize_text(contract_text))
+        if cached is not None:
+            return cached
+        return await self._generate_async(key, model, self._build_summary_prompt(contract_text),
+                                          SUMMARY_GENERATION_CONFIG, self._parse_summary, "Error generating summary")
+    
+    def extract_clauses(self, contract_text: str) -> List[Dict[str, str]]:
+        """Extract and classify clauses from the contract."""
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
+        return self._extract_clauses(model, contract_text)
+    
+    async def extract_clauses_async(self, contract_text: str) -> List[Dict[str, str]]:
+        """Async version of extract_clauses()."""
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
+        return await self._extract_clauses_async(model, contract_text)
+    
+    def _extract_clauses(self, model, contract_text: str) -> List[Dict[str, str]]:
+        key, cached = self._lookup("clauses", model, self._normalize_text(contract_text))
+        if cached is not None:
+            return cached
+        return self._generate(key, model, self._build_clauses_prompt(contract_text),
+                              CLAUSES_GENERATION_CONFIG, self._parse_clauses, "Error extracting clauses")
+    
+    async def _extract_clauses_async(self, model, contract_text: str) -> List[Dict[str, str]]:
+        key, cached = self._lookup("clauses", model, self._normalize_text(contract_text))
+        if cached is not None:
+            return cached
+        return await self._generate_async(key, model, self._build_clauses_prompt(contract_text),
+                                          CLAUSES_GENERATION_CONFIG, self._parse_clauses, "Error extracting clauses")
+    
+    def identify_risks(self, contract_text: str) -> List[Dict[str, str]]:
+        """Identify risky or ambiguous clauses."""
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
+        return self._identify_risks(model, contract_text)
+    
+    async def identify_risks_async(self, contract_text: str) -> List[Dict[str, str]]:
+        """Async version of identify_risks()."""
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
+        return await self._identify_risks_async(model, contract_text)
+    
+    def _identify_risks(self, model, contract_text: str) -> List[Dict[str, str]]:
+        key, cached = self._lookup("risks", model, self._normalize_text(contract_text))
+        if cached is not None:
+            return cached
+        return self._generate(key, model, self._build_risks_prompt(contract_text),
+                              RISKS_GENERATION_CONFIG, self._parse_risks, "Error identifying risks")
+    
+    async def _identify_risks_async(self, model, contract_text: str) -> List[Dict[str, str]]:
+        key, cached = self._lookup("risks", model, self._normalize_text(contract_text))
+        if cached is not None:
+            return cached
+        return await self._generate_async(key, model, self._build_risks_prompt(contract_text),
+                                          RISKS_GENERATION_CONFIG, self._parse_risks, "Error identifying risks")
     
     def analyze(self, contract_text: str) -> ContractAnalysisResult:
-        """Perform complete analysis (3 API calls). Use analyze_efficient() for single call."""
-        self._validate_contract(contract_text)
+        """Perform complete analysis (3 concurrent API calls). Use analyze_efficient() for single call."""
+        # Three prompts each carry the full contract, so this costs ~3x the tokens
+        warnings.warn(
+            "analyze() makes 3 API calls; analyze_efficient() returns the same result "
+            "in 1 call at about a third of the prompt tokens.",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
+        
+        # The calls are independent and block on network I/O, so run them in threads.
+        # Not asyncio.run(self.analyze_async(...)): the SDK's async client is bound to
+        # the event loop that first uses it, so a second asyncio.run() would break it,
+        # and asyncio.run() can't be called from code already inside a loop.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            summary = executor.submit(self._summarize, model, contract_text)
+            clauses = executor.submit(self._extract_clauses, model, contract_text)
+            risky_clauses = executor.submit(self._identify_risks, model, contract_text)
+            
+            return ContractAnalysisResult(
+                summary=summary.result(),
+                clauses=clauses.result(),
+                risky_clauses=risky_clauses.result()
+            )
+    
+    async def analyze_async(self, contract_text: str) -> ContractAnalysisResult:
+        """Async version of analyze(); the 3 API calls run concurrently."""
+        warnings.warn(
+            "analyze_async() makes 3 API calls; analyze_efficient_async() returns the same "
+            "result in 1 call at about a third of the prompt tokens.",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        word_count = self._validate_contract(contract_text)
+        model, _ = self._get_model_for_contract(word_count)
         
-        summary = self.summarize_contract(contract_text)
-        clauses = self.extract_clauses(contract_text)
-        risky_clauses = self.identify_risks(contract_text)
+        summary, clauses, risky_clauses = await asyncio.gather(
+            self._summarize_async(model, contract_text),
+            self._extract_clauses_async(model, contract_text),
+            self._identify_risks_async(model, contract_text)
+        )
         
         return ContractAnalysisResult(
             summary=summary,
@@ -349,116 +916,373 @@ RULES:
             risky_clauses=risky_clauses
         )
     
-    def analyze_efficient(self, contract_text: str) -> ContractAnalysisResult:
-        """Perform complete analysis in single API call (recommended)."""
-        word_count = self._validate_contract(contract_text)
-        model, model_name = self._get_model_for_contract(contract_text)
-        sample_indicators = ", ".join(f'"{ind}"' for ind in self.RISK_INDICATORS[:6])
+    def _build_result(self, result: Dict[str, Any]) -> ContractAnalysisResult:
+        """Build a ContractAnalysisResult from a parsed analysis object."""
+        clauses = self._ensure_all_clause_types(result.get("clauses", []))
         
-        prompt = f"""You are an expert legal contract analyst. Perform a comprehensive analysis of this contract.
-
-Contract:
-{contract_text}
-
-Provide your analysis as a JSON object with this EXACT structure:
-{{
-  "summary": "A concise summary (under 200 words) covering payment terms, confidentiality, termination, and dispute resolution",
-  "clauses": [
-    {{"type": "Payment Terms", "clause": "exact text OR 'Not found'"}},
-    {{"type": "Confidentiality", "clause": "exact text OR 'Not found'"}},
-    {{"type": "Dispute Resolution", "clause": "exact text OR 'Not found'"}},
-    {{"type": "Termination", "clause": "exact text OR 'Not found'"}}
-  ],
-  "risky_clauses": [
-    {{
-      "clause": "exact risky clause text",
-      "reason": "detailed explanation of the risk"
-    }}
-  ]
-}}
-
-CRITICAL INSTRUCTIONS:
-
-1. SUMMARY:
-   - Focus on key business terms
-   - Keep under 200 words
-   - Be professional and clear
-
-2. CLAUSES:
-   - Extract EXACT text from the contract
-   - If a clause type is NOT present, use "Not found"
-   - DO NOT invent clauses - only extract what exists
-   - ALL FOUR types MUST appear in output
-
-3. RISKS:
-   - Look for vague terms like: {sample_indicators}
-   - Flag one-sided or ambiguous clauses
-   - Explain WHY each clause is risky
-   - Consider legal disputes and enforcement issues
-   - If no risks found, use empty array
+        return ContractAnalysisResult(
+            summary=result.get("summary", "Unable to generate summary."),
+            clauses=clauses,
+            risky_clauses=result.get("risky_clauses", [])
+        )
+    
+    def _build_batch_prompt(self, contract_texts: List[str]) -> str:
+        """Build a single prompt that analyzes several contracts at once."""
+        contracts = "\n\n".join(
+            f"[[CONTRACT {i}]]\n{text.strip()}" for i, text in enumerate(contract_texts, 1)
+        )
+        return self._batch_prompt.substitute(count=len(contract_texts), contracts=contracts)
 
-Return ONLY valid JSON, no additional text."""
+    def _group_batch(self, contract_texts: List[str]) -> Dict[str, tuple]:
+        """Validate a batch and group contract indices by the model their length calls for."""
+        if len(contract_texts) > self.MAX_BATCH_SIZE:
+            raise ValueError(
+                f"Batch exceeds maximum size of {self.MAX_BATCH_SIZE} contracts."
+            )
         
+        groups: Dict[str, tuple] = {}
+        for i, contract_text in enumerate(contract_texts):
+            word_count = self._validate_contract(contract_text)
+            model, model_name = self._get_model_for_contract(word_count)
+            groups.setdefault(model_name, (model, []))[1].append(i)
+        
+        return groups
+    
+    def _take_cached(self, model, contract_texts: List[str], indices: List[int],
+                     results: List[Optional[ContractAnalysisResult]]) -> List[Tuple[int, str]]:
+        """Fill results from the cache; return (index, cache key) for each still to analyze."""
+        pending = []
+        for i in indices:
+            key, results[i] = self._lookup("analysis", model, self._normalize_text(contract_texts[i]))
+            if results[i] is None:
+                pending.append((i, key))
+        return pending
+    
+    def _parse_batch_response(self, response_text: str, count: int) -> Optional[List[Dict[str, Any]]]:
+        """Parse a batch response, or return None if it doesn't hold one analysis per contract."""
         try:
-            response = model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
-            clauses = self._ensure_all_clause_types(result.get("clauses", []))
+            analyses = self._parse_json_response(response_text).get("analyses", [])
+        except json.JSONDecodeError:
+            return None
+        
+        if len(analyses) != count or not all(isinstance(a, dict) for a in analyses):
+            return None
+        
+        return analyses
+    
+    def analyze_batch(self, contract_texts: List[str]) -> List[ContractAnalysisResult]:
+        """Analyze several contracts with one API call per model (results keep input order)."""
+        if len(contract_texts) == 1:
+            return [self.analyze_efficient(contract_texts[0])]
+        
+        results: List[Optional[ContractAnalysisResult]] = [None] * len(contract_texts)
+        for model, indices in self._group_batch(contract_texts).values():
+            pending = self._take_cached(model, contract_texts, indices, results)
+            texts = [contract_texts[i] for i, _ in pending]
             
-            return ContractAnalysisResult(
-                summary=result.get("summary", "Unable to generate summary."),
-                clauses=clauses,
-                risky_clauses=result.get("risky_clauses", [])
+            if not texts:
+                continue
+            if len(texts) == 1:
+                results[pending[0][0]] = self.analyze_efficient(texts[0])
+                continue
+            
+            try:
+                response = model.generate_content(
+                    self._build_batch_prompt(texts), generation_config=BATCH_GENERATION_CONFIG
+                )
+            except Exception as e:
+                raise RuntimeError(f"Batch analysis failed: {str(e)}")
+            
+            analyses = self._parse_batch_response(response.text, len(texts))
+            for j, (i, key) in enumerate(pending):
+                if analyses is None:
+                    # Model lost track of the contracts; fall back to one call each
+                    results[i] = self.analyze_efficient(contract_texts[i])
+                else:
+                    results[i] = self._build_result(analyses[j])
+                    self._cache_put(key, results[i])
+        
+        return results
+    
+    async def analyze_batch_async(self, contract_texts: List[str],
+                                  limiter: Optional[asyncio.Semaphore] = None) -> List[ContractAnalysisResult]:
+        """Async version of analyze_batch() using the SDK's native async client.
+        
+        If given, limiter is held for each Gemini call, so per-model batches and
+        the per-contract fallback all count against it.
+        """
+        limit = limiter if limiter is not None else contextlib.nullcontext()
+        
+        async def analyze_one(contract_text: str) -> ContractAnalysisResult:
+            async with limit:
+                return await self.analyze_efficient_async(contract_text)
+        
+        if len(contract_texts) == 1:
+            return [await analyze_one(contract_texts[0])]
+        
+        results: List[Optional[ContractAnalysisResult]] = [None] * len(contract_texts)
+        
+        async def run_group(model, indices: List[int]) -> None:
+            pending = self._take_cached(model, contract_texts, indices, results)
+            texts = [contract_texts[i] for i, _ in pending]
+            
+            if not texts:
+                return
+            if len(texts) == 1:
+                results[pending[0][0]] = await analyze_one(texts[0])
+                return
+            
+            try:
+                async with limit:
+                    response = await model.generate_content_async(
+                        self._build_batch_prompt(texts),
+                        generation_config=BATCH_GENERATION_CONFIG,
+                        request_options=self.ASYNC_REQUEST_OPTIONS
+                    )
+            except Exception as e:
+                raise RuntimeError(f"Batch analysis failed: {str(e)}")
+            
+            analyses = self._parse_batch_response(response.text, len(texts))
+            if analyses is None:
+                # Model lost track of the contracts; fall back to one call each,
+                # each under the limiter
+                fallback = await asyncio.gather(*(analyze_one(t) for t in texts))
+                for (i, _), result in zip(pending, fallback):
+                    results[i] = result
+                return
+            
+            for (i, key), analysis in zip(pending, analyses):
+                results[i] = self._build_result(analysis)
+                self._cache_put(key, results[i])
+        
+        groups = self._group_batch(contract_texts).values()
+        await asyncio.gather(*(run_group(model, indices) for model, indices in groups))
+        
+        return results
+    
+    def _get_efficient_model(self, word_count: int):
+        """Select the model for single-call analysis, carrying the static instructions."""
+        model_name = self._get_model_name_for_contract(word_count)
+        model = self._efficient_models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(
+                model_name,
+                system_instruction=self._efficient_instruction,
+                generation_config=ANALYSIS_GENERATION_CONFIG
             )
+            self._efficient_models[model_name] = model
+        return model
+    
+    def _build_efficient_prompt(self, contract_text: str) -> str:
+        """Build the single-call analysis prompt."""
+        return self._efficient_prompt.substitute(contract=contract_text)
+
+    def _parse_analysis(self, response_text: str) -> ContractAnalysisResult:
+        """Build the result from a single-call analysis response."""
+        return self._build_result(self._parse_json_response(response_text))
+    
+    def _lookup_cached(self, model, contract_text: str) -> Tuple[str, Any, Optional[List[float]]]:
+        """Find an analysis in the exact cache, then the semantic one; returns (key, cached, embedding)."""
+        normalized = self._normalize_text(contract_text)
+        key, cached = self._lookup("analysis", model, normalized)
+        if cached is not None:
+            return key, cached, None
+        
+        embedding = self._embed_contract(normalized)
+        similar = self._semantic_get(model.model_name, embedding)
+        if similar is not None:
+            self._cache_put(key, similar)
+        return key, similar, embedding
+    
+    async def _lookup_cached_async(self, model, contract_text: str) -> Tuple[str, Any, Optional[List[float]]]:
+        """Async version of _lookup_cached()."""
+        normalized = self._normalize_text(contract_text)
+        key, cached = self._lookup("analysis", model, normalized)
+        if cached is not None:
+            return key, cached, None
+        
+        embedding = await self._embed_contract_async(normalized)
+        # The similarity scan is CPU-bound; keep it off the event loop
+        similar = await asyncio.to_thread(self._semantic_get, model.model_name, embedding)
+        if similar is not None:
+            self._cache_put(key, similar)
+        return key, similar, embedding
+    
+    def _scan_sections(self, scanner: _SectionScanner, chunk_text: str) -> List[Tuple[str, Any]]:
+        """Feed a streamed chunk and return the analysis sections it completed."""
+        sections = []
+        for section, value in scanner.feed(chunk_text):
+            if section == "clauses":
+                value = self._ensure_all_clause_types(value)
+            if section in ("summary", "clauses", "risky_clauses"):
+                sections.append((section, value))
+        return sections
+    
+    def _finish_stream(self, key: str, model, embedding: Optional[List[float]],
+                       scanner: _SectionScanner) -> ContractAnalysisResult:
+        """Parse a fully streamed reply and cache the analysis."""
+        try:
+            analysis = self._parse_analysis(scanner.text)
         except json.JSONDecodeError as e:
             raise RuntimeError(f"Failed to parse model response: {str(e)}")
+        
+        self._cache_put(key, analysis)
+        self._semantic_put(model.model_name, embedding, analysis)
+        return analysis
+    
+    def analyze_efficient(self, contract_text: str) -> ContractAnalysisResult:
+        """Perform complete analysis in single API call (recommended)."""
+        word_count = self._validate_contract(contract_text)
+        model = self._get_efficient_model(word_count)
+        key, cached, embedding = self._lookup_cached(model, contract_text)
+        if cached is not None:
+            return cached
+        
+        # The model carries the analysis generation config
+        result = self._generate(key, model, self._build_efficient_prompt(contract_text),
+                                None, self._parse_analysis, "Analysis failed")
+        self._semantic_put(model.model_name, embedding, result)
+        return result
+    
+    async def analyze_efficient_async(self, contract_text: str) -> ContractAnalysisResult:
+        """Async version of analyze_efficient() using the SDK's native async client."""
+        word_count = self._validate_contract(contract_text)
+        model = self._get_efficient_model(word_count)
+        key, cached, embedding = await self._lookup_cached_async(model, contract_text)
+        if cached is not None:
+            return cached
+        
+        result = await self._generate_async(key, model, self._build_efficient_prompt(contract_text),
+                                            None, self._parse_analysis, "Analysis failed")
+        self._semantic_put(model.model_name, embedding, result)
+        return result
+    
+    def analyze_efficient_stream(self, contract_text: str) -> Iterator[Any]:
+        """Stream analyze_efficient(): yields (section, value) as each section completes, then the result."""
+        word_count = self._validate_contract(contract_text)
+        model = self._get_efficient_model(word_count)
+        key, cached, embedding = self._lookup_cached(model, contract_text)
+        if cached is not None:
+            yield from cached.to_dict().items()
+            yield cached
+            return
+        
+        scanner = _SectionScanner()
+        try:
+            response = model.generate_content(self._build_efficient_prompt(contract_text), stream=True)
+            for chunk in response:
+                yield from self._scan_sections(scanner, chunk.text)
+        except Exception as e:
+            raise RuntimeError(f"Analysis failed: {str(e)}")
+        
+        yield self._finish_stream(key, model, embedding, scanner)
+    
+    async def analyze_efficient_stream_async(self, contract_text: str) -> AsyncIterator[Any]:
+        """Async version of analyze_efficient_stream(): yields (section, value) pairs, then the result."""
+        word_count = self._validate_contract(contract_text)
+        model = self._get_efficient_model(word_count)
+        key, cached, embedding = await self._lookup_cached_async(model, contract_text)
+        if cached is not None:
+            for section in cached.to_dict().items():
+                yield section
+            yield cached
+            return
+        
+        scanner = _SectionScanner()
+        try:
+            response = await model.generate_content_async(
+                self._build_efficient_prompt(contract_text), stream=True,
+                request_options=self.ASYNC_REQUEST_OPTIONS
+            )
+            async for chunk in response:
+                for section in self._scan_sections(scanner, chunk.text):
+                    yield section
         except Exception as e:
             raise RuntimeError(f"Analysis failed: {str(e)}")
+        
+        yield self._finish_stream(key, model, embedding, scanner)
+    
+    def analyze_many(self, contract_texts: List[str], concurrency: int = 8) -> List[ContractAnalysisResult]:
+        """Run analyze_efficient() on many contracts, up to `concurrency` calls at a time."""
+        unique = list(dict.fromkeys(contract_texts))
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(unique)))) as executor:
+            by_text = dict(zip(unique, executor.map(self.analyze_efficient, unique)))
+        return self._expand_duplicates(contract_texts, by_text)
+    
+    async def analyze_many_async(self, contract_texts: List[str],
+                                 concurrency: int = 8) -> List[ContractAnalysisResult]:
+        """Async version of analyze_many() using the SDK's native async client."""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def one(contract_text: str) -> ContractAnalysisResult:
+            async with semaphore:
+                return await self.analyze_efficient_async(contract_text)
+        
+        unique = list(dict.fromkeys(contract_texts))
+        by_text = dict(zip(unique, await asyncio.gather(*(one(t) for t in unique))))
+        return self._expand_duplicates(contract_texts, by_text)
+    
+    def _expand_duplicates(self, contract_texts: List[str],
+                           by_text: Dict[str, ContractAnalysisResult]) -> List[ContractAnalysisResult]:
+        """Map results back to input order; repeated contracts get their own copy."""
+        results = []
+        seen = set()
+        for contract_text in contract_texts:
+            result = by_text[contract_text]
+            results.append(copy.deepcopy(result) if contract_text in seen else result)
+            seen.add(contract_text)
+        return results
+    
+    def find_risk_indicators(self, contract_text: str) -> List[str]:
+        """Return the RISK_INDICATORS phrases present in the contract, in order of first appearance."""
+        canonical = {ind.lower(): ind for ind in self.RISK_INDICATORS}
+        found = dict.fromkeys(
+            canonical[match.group(0).lower()] for match in self.RISK_INDICATOR_RE.finditer(contract_text)
+        )
+        return list(found)
     
     def get_contract_info(self, contract_text: str) -> Dict[str, Any]:
         """Get contract info (word count, model) without analyzing."""
         word_count = self._get_word_count(contract_text)
-        _, model_name = self._get_model_for_contract(contract_text)
+        model_name = self._get_model_name_for_contract(word_count)
         
         return {
             "word_count": word_count,
             "max_words": self.max_words,
             "is_valid": word_count <= self.max_words and word_count > 0,
             "model_to_use": model_name,
-            "is_long_context": word_count >= self.LONG_CONTRACT_THRESHOLD
+            "is_long_context": word_count >= self.LONG_CONTRACT_THRESHOLD,
+            "risk_indicators": self.find_risk_indicators(contract_text)
         }
 
 
 def format_output(result: ContractAnalysisResult, show_full_json: bool = True) -> None:
     """Print analysis result in formatted manner."""
-    print("\n" + "=" * 80)
-    print("CONTRACT ANALYSIS RESULTS")
-    print("=" * 80)
+    # Sections are plain text; the result is serialized at most once, for the full JSON
+    lines = ["\n" + "=" * 80, "CONTRACT ANALYSIS RESULTS", "=" * 80]
     
     # Summary
-    print("\n📋 SUMMARY:")
-    print("-" * 40)
-    print(json.dumps({"summary": result.summary}, indent=2, ensure_ascii=False))
+    lines += ["\n📋 SUMMARY:", "-" * 40, result.summary]
     
     # Clauses
-    print("\n📑 EXTRACTED CLAUSES:")
-    print("-" * 40)
-    print(json.dumps({"clauses": result.clauses}, indent=2, ensure_ascii=False))
+    lines += ["\n📑 EXTRACTED CLAUSES:", "-" * 40]
+    for clause in result.clauses:
+        lines.append(f"  [{clause.get('type', 'Other')}] {clause.get('clause', '')}")
     
     # Risks
-    print("\n⚠️  RISK FLAGS:")
-    print("-" * 40)
+    lines += ["\n⚠️  RISK FLAGS:", "-" * 40]
     if result.risky_clauses:
-        print(json.dumps({"risky_clauses": result.risky_clauses}, indent=2, ensure_ascii=False))
+        for i, risk in enumerate(result.risky_clauses, 1):
+            lines.append(f"  {i}. {risk.get('clause', '')}")
+            lines.append(f"     Reason: {risk.get('reason', '')}")
     else:
-        print(json.dumps({"risky_clauses": []}, indent=2))
-        print("  (No risky clauses identified)")
+        lines.append("  (No risky clauses identified)")
     
     # Full JSON output
     if show_full_json:
-        print("\n" + "=" * 80)
-        print("COMPLETE JSON OUTPUT:")
-        print("=" * 80)
-        print(result.to_json())
+        lines += ["\n" + "=" * 80, "COMPLETE JSON OUTPUT:", "=" * 80, result.to_json()]
+    
+    print("\n".join(lines))
 
 
 def get_api_key() -> str:
@@ -534,10 +1358,17 @@ This agreement is valid for one year from the date of signing.
 
 
 def get_contract_from_terminal() -> str:
-    """Get contract text from user via terminal (end with double Enter)."""
+    """Get contract text from user via terminal (end with double Enter, or EOF when piped)."""
     print("\n" + "=" * 80)
     print("ENTER YOUR CONTRACT TEXT")
     print("=" * 80)
+    
+    # Piped input arrives in one read; no need to go line by line
+    if not sys.stdin.isatty():
+        print("Reading contract from standard input until EOF...")
+        print("-" * 80)
+        return sys.stdin.read().strip()
+    
     print("Paste or type your contract below.")
     print("When finished, press Enter twice (empty line) to submit.")
     print("Or press Ctrl+C to cancel.")
@@ -654,7 +1485,12 @@ def main():
             # Analyze
             print("\n🔍 Analyzing contract...")
             try:
-                result = analyzer.analyze_efficient(contract)
+                # Sections stream in; report each as it lands so the wait isn't silent
+                for item in analyzer.analyze_efficient_stream(contract):
+                    if isinstance(item, ContractAnalysisResult):
+                        result = item
+                    else:
+                        print(f"   ✓ {item[0].replace('_', ' ')} received")
                 
                 # Display results
                 format_output(result)
@@ -0,0 +1,225 @@
+async function loadSample(type) {
+    const response = await fetch('/api/sample/' + type);
+    document.getElementById('contractText').value = await response.text();
+}
+
+function showTab(tabName) {
+    // Hide all tabs
+    document.querySelectorAll('.tab-content').forEach(tab => {
+        tab.classList.remove('active');
+    });
+    document.querySelectorAll('.tab').forEach(tab => {
+        tab.classList.remove('active');
+    });
+
+    // Show selected tab
+    document.getElementById('tab-' + tabName).classList.add('active');
+    event.target.classList.add('active');
+}
+
+function clearAll() {
+    document.getElementById('contractText').value = '';
+    document.getElementById('emptyState').style.display = 'block';
+    document.getElementById('stats').style.display = 'none';
+    document.getElementById('errorState').style.display = 'none';
+    document.getElementById('metadataBanner').style.display = 'none';
+    document.querySelectorAll('.tab-content').forEach(tab => {
+        tab.classList.remove('active');
+    });
+    document.getElementById('summaryContent').innerHTML = '';
+    document.getElementById('clausesContent').innerHTML = '';
+    document.getElementById('risksContent').innerHTML = '';
+    document.getElementById('jsonContent').textContent = '';
+}
+
+// Results from this session keyed by the SHA-256 of the contract text
+const analysisResults = new Map();
+let analysisInProgress = false;
+
+async function hashContract(text) {
+    // SubtleCrypto is only available in secure contexts (HTTPS or localhost)
+    if (!window.crypto || !crypto.subtle) return null;
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+    return Array.from(new Uint8Array(digest))
+        .map(b => b.toString(16).padStart(2, '0'))
+        .join('');
+}
+
+async function analyzeContract() {
+    const contractText = document.getElementById('contractText').value.trim();
+
+    if (!contractText) {
+        alert('Please enter a contract to analyze');
+        return;
+    }
+
+    // Ignore clicks while an analysis is already running
+    if (analysisInProgress) return;
+    analysisInProgress = true;
+
+    // Show loading
+    document.getElementById('loading').classList.add('active');
+    document.getElementById('emptyState').style.display = 'none';
+    document.getElementById('errorState').style.display = 'none';
+    document.getElementById('stats').style.display = 'none';
+    document.querySelectorAll('.tab-content').forEach(tab => {
+        tab.classList.remove('active');
+    });
+    document.getElementById('analyzeBtn').disabled = true;
+
+    try {
+        const hash = await hashContract(contractText);
+        const headers = {
+            'Content-Type': 'application/json',
+        };
+        // Let the server confirm a result we already have instead of resending it
+        if (hash && analysisResults.has(hash)) {
+            headers['If-None-Match'] = '"' + hash + '"';
+        }
+
+        const response = await fetch('/api/analyze/stream', {
+            method: 'POST',
+            headers: headers,
+            body: JSON.stringify({ contract_text: contractText })
+        });
+
+        if (response.status === 304) {
+            displayResults(analysisResults.get(hash));
+            return;
+        }
+
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Analysis failed');
+        }
+
+        const result = await readAnalysisStream(response);
+        if (hash) analysisResults.set(hash, result);
+        displayResults(result);
+
+    } catch (error) {
+        document.getElementById('loading').classList.remove('active');
+        document.getElementById('errorState').style.display = 'block';
+        document.getElementById('errorState').textContent = '❌ Error: ' + error.message;
+    } finally {
+        document.getElementById('analyzeBtn').disabled = false;
+        analysisInProgress = false;
+    }
+}
+
+async function readAnalysisStream(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Server-Sent Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const line = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            if (!line.startsWith('data: ')) continue;
+
+            const event = JSON.parse(line.slice(6));
+            if (event.type === 'section') {
+                showSection(event.section, event.value);
+            } else if (event.type === 'result') {
+                return event.result;
+            } else if (event.type === 'error') {
+                throw new Error(event.detail);
+            }
+        }
+    }
+
+    throw new Error('Analysis stream ended unexpectedly');
+}
+
+function showSection(section, value) {
+    // Show the summary as soon as the server has parsed it, before the rest arrives
+    if (section !== 'summary') return;
+
+    document.getElementById('loading').classList.remove('active');
+    document.getElementById('tab-summary').classList.add('active');
+    document.getElementById('summaryContent').textContent = value;
+}
+
+function displayResults(result) {
+    // Hide loading
+    document.getElementById('loading').classList.remove('active');
+
+    // Show metadata banner
+    if (result.metadata) {
+        document.getElementById('metadataBanner').style.display = 'flex';
+        document.getElementById('wordCount').textContent = result.metadata.word_count.toLocaleString();
+        document.getElementById('modelUsed').textContent = result.metadata.model_used;
+
+        if (result.metadata.is_long_context) {
+            document.getElementById('longContextBadge').style.display = 'block';
+        } else {
+            document.getElementById('longContextBadge').style.display = 'none';
+        }
+    }
+
+    // Show stats
+    document.getElementById('stats').style.display = 'flex';
+
+    // Count only found clauses
+    const foundClauses = result.clauses.filter(c => c.clause !== 'Not found').length;
+    const notFoundClauses = result.clauses.filter(c => c.clause === 'Not found').length;
+    document.getElementById('clauseCount').textContent = foundClauses + (notFoundClauses > 0 ? ` (${notFoundClauses} not found)` : '');
+    document.getElementById('riskCount').textContent = result.risky_clauses.length;
+
+    // Summary
+    document.getElementById('summaryContent').innerHTML = result.summary;
+
+    // Clauses - with special handling for "Not found"
+    let clausesHtml = '';
+    if (result.clauses.length === 0) {
+        clausesHtml = '<p style="color: #888;">No clauses extracted</p>';
+    } else {
+        result.clauses.forEach(clause => {
+            const isNotFound = clause.clause === 'Not found';
+            const itemClass = isNotFound ? 'clause-item clause-not-found' : 'clause-item';
+            const clauseText = isNotFound
+                ? '<em>⚠️ Not found in contract</em>'
+                : clause.clause;
+
+            clausesHtml += `
+                <div class="${itemClass}">
+                    <div class="clause-type">${clause.type}${isNotFound ? ' <span class="badge badge-warning">Missing</span>' : ''}</div>
+                    <div class="clause-text">${clauseText}</div>
+                </div>
+            `;
+        });
+    }
+    document.getElementById('clausesContent').innerHTML = clausesHtml;
+
+    // Risks
+    let risksHtml = '';
+    if (result.risky_clauses.length === 0) {
+        risksHtml = '<p style="color: #4ade80;">✓ No significant risks identified</p>';
+    } else {
+        result.risky_clauses.forEach(risk => {
+            risksHtml += `
+                <div class="risk-item">
+                    <span class="risk-label">⚠️ RISK</span>
+                    <div class="risk-clause">"${risk.clause}"</div>
+                    <div class="risk-reason"><strong>Why it's risky:</strong> ${risk.reason}</div>
+                </div>
+            `;
+        });
+    }
+    document.getElementById('risksContent').innerHTML = risksHtml;
+
+    // JSON
+    document.getElementById('jsonContent').textContent = JSON.stringify(result, null, 2);
+
+    // Show summary tab
+    document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
+    document.querySelector('.tab').classList.add('active');
+    document.getElementById('tab-summary').classList.add('active');
+}
@@ -5,204 +5,277 @@ This module contains sample contracts and expected outputs for testing
 the ContractAnalyzer functionality.
 """
 
+import asyncio
+import functools
+import gzip
+import hashlib
 import json
 import os
+import pprint
+import re
 import sys
+import textwrap
+from operator import methodcaller
+from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import contract_analyzer
 from contract_analyzer import ContractAnalyzer, ContractAnalysisResult, format_output
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional; falls back to the stdlib json module
+
+# C-level clause.get('type'); unlike itemgetter it tolerates clauses missing the key
+_get_type = methodcaller('get', 'type')
+
+# Plain ASCII status tags keep captured CI logs small and encoding-safe
+OK = "[OK]"
+FAIL = "[FAIL]"
+WARN = "[WARN]"
+
 
 # =============================================================================
 # SAMPLE CONTRACTS
 # =============================================================================
 
-SAMPLE_CONTRACTS = {
-    "basic_contract": {
-        "description": "Basic service agreement with all key clause types",
-        "text": """
-        This agreement is between Company A and Company B. The payment for services 
-        rendered shall be made in two equal installments, with the first payment due 
-        on January 1, 2026, and the second due upon completion of the project. 
-        Confidential information shared between the parties shall be kept confidential 
-        for a period of 5 years from the termination of this agreement. Either party 
-        may terminate this agreement with 30 days' notice. Dispute resolution will 
-        occur via binding arbitration in New York.
-        """,
-        "expected_clause_types": ["Payment Terms", "Confidentiality", "Termination", "Dispute Resolution"],
-        "expected_risk_areas": ["project completion ambiguity", "generic termination clause"]
-    },
-    
-    "complex_contract": {
-        "description": "More complex contract with multiple clauses and risks",
-        "text": """
-        SERVICE AGREEMENT
-
-        This Service Agreement ("Agreement") is entered into as of February 1, 2026, 
-        by and between TechCorp Inc. ("Service Provider") and GlobalEnterprises LLC ("Client").
-
-        1. SERVICES AND PAYMENT
-        The Service Provider agrees to provide software development services as described 
-        in Exhibit A. The Client shall pay a total fee of $150,000, payable as follows:
-        - Initial deposit of $50,000 due upon signing
-        - $50,000 due upon completion of Phase 1 milestones
-        - $50,000 due upon final delivery and acceptance
-        
-        Late payments shall incur a penalty of 1.5% per month. The Service Provider 
-        reserves the right to suspend services if payment is more than 30 days overdue.
-
-        2. CONFIDENTIALITY
-        Each party agrees to maintain the confidentiality of any proprietary information 
-        disclosed by the other party. This obligation shall continue for a period of 
-        three (3) years following termination of this Agreement. Confidential information 
-        does not include information that is publicly available or independently developed.
-
-        3. INTELLECTUAL PROPERTY
-        All intellectual property created during the course of this Agreement shall be 
-        owned by the Client upon full payment. The Service Provider retains the right 
-        to use general knowledge and skills acquired during the project.
-
-        4. TERMINATION
-        Either party may terminate this Agreement for cause with 15 days written notice 
-        if the other party materially breaches any provision and fails to cure such breach 
-        within the notice period. The Client may terminate for convenience with 30 days 
-        notice, subject to payment of all work completed and reasonable wind-down costs.
-
-        5. DISPUTE RESOLUTION
-        Any disputes arising from this Agreement shall first be addressed through good 
-        faith negotiation. If negotiation fails, disputes shall be resolved through 
-        binding arbitration under the rules of the American Arbitration Association 
-        in San Francisco, California. Each party shall bear its own costs.
-
-        6. LIMITATION OF LIABILITY
-        In no event shall either party be liable for any indirect, incidental, special, 
-        or consequential damages. The Service Provider's total liability shall not 
-        exceed the total fees paid under this Agreement.
-
-        7. GENERAL PROVISIONS
-        This Agreement constitutes the entire agreement between the parties. Any 
-        modifications must be in writing and signed by both parties. This Agreement 
-        shall be governed by the laws of the State of California.
-        """,
-        "expected_clause_types": ["Payment Terms", "Confidentiality", "Termination", "Dispute Resolution"],
-        "expected_risk_areas": ["material breach", "good faith negotiation", "reasonable wind-down costs"]
-    },
-    
-    "risky_contract": {
-        "description": "Contract with multiple vague and risky clauses",
-        "text": """
-        CONSULTING AGREEMENT
-        
-        This Agreement is made between ABC Consulting ("Consultant") and XYZ Corp ("Company").
-        
-        SCOPE OF WORK
-        The Consultant shall provide consulting services as reasonably requested by the 
-        Company. The specific tasks will be determined at the discretion of the Company's 
-        management team. The Consultant shall use best efforts to complete all assignments 
-        in a timely manner.
-        
-        COMPENSATION
-        The Company shall pay the Consultant a reasonable fee for services rendered, to 
-        be determined based on the complexity of work performed. Payment shall be made 
-        within a reasonable time after invoice submission.
-        
-        CONFIDENTIALITY
-        The Consultant agrees to keep all Company information confidential for an 
-        indefinite period. What constitutes confidential information shall be determined 
-        by the Company as deemed appropriate.
-        
-        TERMINATION
-        Either party may terminate this Agreement at any time, with or without cause, 
-        effective immediately upon verbal or written notice.
-        
-        NON-COMPETE
-        The Consultant agrees not to work with any competitors of the Company for a 
-        reasonable period after termination, in any geographic area where the Company 
-        conducts business.
-        
-        INDEMNIFICATION
-        The Consultant shall indemnify and hold harmless the Company from any and all 
-        claims, damages, and expenses, without limitation, arising from the Consultant's 
-        services.
-        
-        DISPUTE RESOLUTION
-        Any disputes shall be resolved in a manner deemed appropriate by the Company.
-        """,
-        "expected_clause_types": ["Payment Terms", "Confidentiality", "Termination", "Dispute Resolution"],
-        "expected_risk_areas": [
-            "reasonably requested", "at the discretion of", "best efforts", 
-            "reasonable fee", "reasonable time", "indefinite period", 
-            "as deemed appropriate", "without limitation", "reasonable period"
-        ]
-    },
-    
-    "minimal_contract": {
-        "description": "Minimal contract with few clauses",
-        "text": """
-        Agreement between Party A and Party B.
-        
-        Party A will provide services to Party B. 
-        Party B will pay $10,000 for the services.
-        This agreement is valid for one year from the date of signing.
-        """,
-        "expected_clause_types": ["Payment Terms"],
-        "expected_risk_areas": ["no termination clause", "no dispute resolution", "no confidentiality"]
-    },
-    
-    "employment_contract": {
-        "description": "Employment agreement sample",
-        "text": """
-        EMPLOYMENT AGREEMENT
-        
-        This Employment Agreement is entered into between TechStartup Inc. ("Employer") 
-        and John Smith ("Employee").
-        
-        1. POSITION AND DUTIES
-        The Employee is hired as a Senior Software Engineer. Duties shall include software 
-        development, code review, and mentoring junior developers. Additional duties may 
-        be assigned as needed by the Employer.
-        
-        2. COMPENSATION
-        Base Salary: $120,000 per year, paid bi-weekly
-        Bonus: Discretionary annual bonus of up to 20% based on performance
-        Equity: 10,000 stock options vesting over 4 years with a 1-year cliff
-        
-        3. BENEFITS
-        The Employee shall be entitled to standard company benefits including health 
-        insurance, 401(k) matching, and 20 days of paid time off annually.
-        
-        4. CONFIDENTIALITY
-        The Employee agrees to maintain strict confidentiality regarding all proprietary 
-        information, trade secrets, and business strategies of the Employer. This 
-        obligation survives termination of employment indefinitely.
-        
-        5. INTELLECTUAL PROPERTY
-        All inventions, discoveries, and works created by the Employee during employment 
-        and related to the Employer's business shall be the sole property of the Employer.
-        
-        6. NON-COMPETE AND NON-SOLICITATION
-        For a period of 12 months following termination, the Employee agrees not to:
-        - Work for any direct competitor within a 50-mile radius
-        - Solicit any employees or customers of the Employer
-        
-        7. TERMINATION
-        Either party may terminate this Agreement with 2 weeks written notice. The 
-        Employer may terminate immediately for cause, including but not limited to 
-        misconduct, breach of this Agreement, or poor performance.
-        
-        8. DISPUTE RESOLUTION
-        Any disputes shall be resolved through mediation, followed by binding arbitration 
-        if mediation is unsuccessful. Venue shall be in San Francisco, California.
-        
-        9. GOVERNING LAW
-        This Agreement shall be governed by the laws of the State of California.
-        """,
-        "expected_clause_types": ["Payment Terms", "Confidentiality", "Termination", "Dispute Resolution"],
-        "expected_risk_areas": ["discretionary bonus", "as needed", "indefinitely", "including but not limited to"]
+# Loaded from sample_contracts.json on first access (see __getattr__ below)
+SAMPLES_PATH = Path(__file__).parent / "sample_contracts.json"
+
+
+def _normalize_contract_text(text: str) -> str:
+    """
+    Drop indentation and repeated spaces, which only cost prompt tokens.
+    
+    Args:
+        text: Raw contract text
+    
+    Returns:
+        The text with line breaks kept, so clause boundaries survive
+    """
+    text = textwrap.dedent(text).strip()
+    text = re.sub(r"[ \t]+", " ", text)
+    return re.sub(r" *\n *", "\n", text)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_samples() -> dict:
+    """
+    Load the sample contracts once, with their text normalized.
+    
+    Returns:
+        Dictionary of sample contracts keyed by test case name
+    """
+    samples = json.loads(SAMPLES_PATH.read_text(encoding="utf-8"))
+    for data in samples.values():
+        data["text"] = _normalize_contract_text(data["text"])
+        # Expectations are only compared against, so hash them once here
+        data["expected_clause_types"] = frozenset(data.get("expected_clause_types", ()))
+        data["expected_risk_areas"] = frozenset(data.get("expected_risk_areas", ()))
+    return samples
+
+
+@functools.lru_cache(maxsize=1)
+def _risk_area_pattern() -> re.Pattern:
+    """
+    Compile every sample's expected risk areas into one pattern.
+    
+    Returns:
+        Case-insensitive pattern that reports overlapping matches, longest first
+    """
+    areas = {area for data in _load_samples().values() for area in data.get('expected_risk_areas', [])}
+    alternation = "|".join(re.escape(area) for area in sorted(areas, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+
+def _flagged_risk_areas(result: ContractAnalysisResult, expected_areas: frozenset) -> list:
+    """
+    Find which expected risk areas the identified risks mention.
+    
+    Args:
+        result: The analysis result
+        expected_areas: Risk areas the test case expects
+    
+    Returns:
+        The expected areas that appear in a risky clause or its reason
+    """
+    flagged_text = " ".join(
+        f"{risk.get('clause', '')} {risk.get('reason', '')}" for risk in result.risky_clauses
+    )
+    # One scan over the text for all phrases, then intersect with this case's list
+    hits = {match.group(1).lower() for match in _risk_area_pattern().finditer(flagged_text)}
+    return sorted(area for area in expected_areas if area.lower() in hits)
+
+
+def __getattr__(name: str):
+    # PEP 562: `test_cases.SAMPLE_CONTRACTS` reads the JSON only when first used
+    if name == "SAMPLE_CONTRACTS":
+        return _load_samples()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Sample contracts analyzed at once; keeps us under the Gemini rate limit
+TEST_CONCURRENCY = 5
+
+# Analyses persisted between runs, one JSON file per (contract text, model, prompts).
+# CONTRACT_CACHE=off or --no-cache re-analyzes every contract (and refreshes the cache)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".contract_cache")
+CACHE_ENABLED = os.getenv("CONTRACT_CACHE", "on").lower() != "off"
+
+
+@functools.lru_cache(maxsize=4)
+def _get_analyzer(api_key: str = None) -> ContractAnalyzer:
+    """
+    Build one analyzer per API key, shared by the test runs in this process.
+    
+    Args:
+        api_key: Google API key (optional, will use environment variable if not provided)
+    
+    Returns:
+        The ContractAnalyzer instance (a failed construction is not cached)
+    """
+    return ContractAnalyzer(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=1)
+def _prompt_fingerprint() -> str:
+    """
+    Fingerprint of the prompts and output schemas, so editing them invalidates the cache.
+    
+    Returns:
+        Short hex digest
+    """
+    parts = [
+        contract_analyzer.EFFICIENT_SYSTEM_INSTRUCTION,
+        contract_analyzer.EFFICIENT_PROMPT,
+        contract_analyzer.BATCH_PROMPT,
+        contract_analyzer.ANALYSIS_GENERATION_CONFIG,
+        contract_analyzer.BATCH_GENERATION_CONFIG,
+    ]
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def _cache_path(analyzer: ContractAnalyzer, contract_text: str) -> str:
+    """
+    Path of the cached analysis for a contract on the model it would be sent to.
+    
+    Args:
+        analyzer: The ContractAnalyzer instance
+        contract_text: The contract text
+    
+    Returns:
+        Path of the cache file (which may not exist yet)
+    """
+    digest = hashlib.sha256(f"{_prompt_fingerprint()}|{contract_text}".encode("utf-8")).hexdigest()
+    model_name = analyzer.get_contract_info(contract_text)["model_to_use"]
+    return os.path.join(CACHE_DIR, f"{digest}-{model_name}.json")
+
+
+def _load_cached_result(path: str) -> ContractAnalysisResult:
+    """
+    Load a cached analysis.
+    
+    Args:
+        path: Cache file path
+    
+    Returns:
+        The cached result, or None if missing, unreadable or the cache is disabled
+    """
+    if not CACHE_ENABLED:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return ContractAnalysisResult.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _store_cached_result(path: str, result: ContractAnalysisResult) -> None:
+    """
+    Save an analysis to the cache; failures only cost a repeat API call next run.
+    
+    Args:
+        path: Cache file path
+        result: The analysis result
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f)
+    except OSError:
+        pass
+
+
+def _report_test_case(contract_name: str, contract_data: dict,
+                      result: ContractAnalysisResult = None, error: Exception = None,
+                      cached: bool = False) -> tuple:
+    """
+    Build the printed report and result record for one test case.
+    
+    Args:
+        contract_name: Name of the test case
+        contract_data: Dictionary containing contract details
+        result: The analysis result, if the analysis succeeded
+        error: The exception raised, if the analysis failed
+        cached: Whether the result came from the on-disk cache rather than Gemini
+    
+    Returns:
+        Tuple of (report lines, test result dictionary)
+    """
+    lines = [
+        f"\n{'='*80}",
+        f"TEST CASE: {contract_name}",
+        f"Description: {contract_data['description']}",
+        f"{'='*80}"
+    ]
+    if cached:
+        lines.append(f"{WARN} Served from {CACHE_DIR} (set CONTRACT_CACHE=off to re-analyze)")
+    
+    if error is not None:
+        lines.append(f"\n{FAIL} Error: {str(error)}")
+        return lines, {
+            "status": "error",
+            "error": str(error)
+        }
+    
+    # Check clause types extracted ("Not found" placeholders don't count)
+    extracted_types = list(map(_get_type, result.clauses))
+    found_types = {clause.get('type') for clause in result.clauses if clause.get('clause') != "Not found"}
+    expected_types = contract_data.get('expected_clause_types', frozenset())
+    missing_types = sorted(expected_types - found_types)
+    
+    # Previews are for people watching a terminal; captured runs have the NDJSON results
+    show_previews = sys.stdout.isatty()
+    shorten = textwrap.shorten
+    
+    if show_previews:
+        lines.append(f"\nSummary Preview: {shorten(result.summary, width=200, placeholder='...')}")
+    lines.append(f"\nExtracted Clause Types: {extracted_types}")
+    lines.append(f"   Expected Types: {sorted(expected_types)}")
+    if missing_types:
+        lines.append(f"   Missing Types: {missing_types}")
+    
+    expected_areas = contract_data.get('expected_risk_areas', frozenset())
+    flagged_areas = _flagged_risk_areas(result, expected_areas) if expected_areas else []
+    
+    lines.append(f"\nRisks Identified: {len(result.risky_clauses)}")
+    if show_previews:
+        for i, risk in enumerate(result.risky_clauses[:3], 1):
+            lines.append(f"   {i}. {shorten(risk.get('reason', ''), width=100, placeholder='...')}")
+    lines.append(f"   Expected Risk Areas Flagged: {len(flagged_areas)}/{len(expected_areas)}")
+    
+    return lines, {
+        "status": "success",
+        "cached": cached,
+        "result": result.to_dict(),
+        "clause_types_found": extracted_types,
+        "missing_clause_types": missing_types,
+        "risk_areas_flagged": flagged_areas,
+        "risks_count": len(result.risky_clauses)
     }
-}
 
 
 def run_test_case(analyzer: ContractAnalyzer, contract_name: str, contract_data: dict) -> dict:
@@ -217,79 +290,144 @@ def run_test_case(analyzer: ContractAnalyzer, contract_name: str, contract_data:
     Returns:
         Dictionary with test results
     """
-    print(f"\n{'='*80}")
-    print(f"TEST CASE: {contract_name}")
-    print(f"Description: {contract_data['description']}")
-    print(f"{'='*80}")
+    try:
+        path = _cache_path(analyzer, contract_data['text'])
+        result = _load_cached_result(path)
+        cached = result is not None
+        if not cached:
+            result = analyzer.analyze_efficient(contract_data['text'])
+            _store_cached_result(path, result)
+        lines, record = _report_test_case(contract_name, contract_data, result=result, cached=cached)
+    except Exception as e:
+        lines, record = _report_test_case(contract_name, contract_data, error=e)
+    
+    # One write per case, so concurrent callers never interleave their lines
+    sys.stdout.write("\n".join(lines) + "\n")
+    return record
+
+
+async def run_test_case_async(analyzer: ContractAnalyzer, contract_name: str,
+                              contract_data: dict, semaphore: asyncio.Semaphore) -> tuple:
+    """
+    Run analysis on a single test case without printing, so concurrent cases don't interleave.
+    
+    Args:
+        analyzer: The ContractAnalyzer instance
+        contract_name: Name of the test case
+        contract_data: Dictionary containing contract details
+        semaphore: Limits how many cases call the API at once
     
+    Returns:
+        Tuple of (report lines, test result dictionary)
+    """
     try:
-        result = analyzer.analyze_efficient(contract_data['text'])
-        
-        # Check clause types extracted
-        extracted_types = [clause.get('type') for clause in result.clauses]
-        expected_types = contract_data.get('expected_clause_types', [])
-        
-        print(f"\n📋 Summary Preview: {result.summary[:200]}...")
-        print(f"\n📑 Extracted Clause Types: {extracted_types}")
-        print(f"   Expected Types: {expected_types}")
-        
-        print(f"\n⚠️  Risks Identified: {len(result.risky_clauses)}")
-        for i, risk in enumerate(result.risky_clauses[:3], 1):
-            reason = risk.get('reason', '')[:100]
-            print(f"   {i}. {reason}...")
-        
-        return {
-            "status": "success",
-            "result": result.to_dict(),
-            "clause_types_found": extracted_types,
-            "risks_count": len(result.risky_clauses)
-        }
-        
+        path = _cache_path(analyzer, contract_data['text'])
+        result = _load_cached_result(path)
+        cached = result is not None
+        if not cached:
+            async with semaphore:
+                result = await analyzer.analyze_efficient_async(contract_data['text'])
+            _store_cached_result(path, result)
+        return _report_test_case(contract_name, contract_data, result=result, cached=cached)
     except Exception as e:
-        print(f"\n❌ Error: {str(e)}")
-        return {
-            "status": "error",
-            "error": str(e)
-        }
+        return _report_test_case(contract_name, contract_data, error=e)
+
+
+def _ndjson_line(record: dict) -> bytes:
+    """
+    Serialize one test record as a newline-terminated JSON line.
+    
+    Args:
+        record: Test result dictionary
+    
+    Returns:
+        UTF-8 encoded JSON line
+    """
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
 
 
-def run_all_tests(api_key: str = None) -> dict:
+async def run_all_tests(api_key: str = None, results_file: str = "test_results.ndjson") -> dict:
     """
-    Run all test cases.
+    Run all test cases, sending uncached contracts to Gemini in one batch prompt.
     
     Args:
         api_key: Google API key (optional, will use environment variable if not provided)
+        results_file: NDJSON file that receives each full test result as it is reported
         
     Returns:
-        Dictionary with all test results
+        Dictionary with each test's status (full results are only in results_file)
     """
     print("\n" + "=" * 80)
     print("RUNNING ALL TEST CASES")
     print("=" * 80)
     
     try:
-        analyzer = ContractAnalyzer(api_key=api_key)
+        analyzer = _get_analyzer(api_key)
     except ValueError as e:
-        print(f"❌ Failed to initialize analyzer: {e}")
+        print(f"{FAIL} Failed to initialize analyzer: {e}")
         return {"status": "failed", "error": str(e)}
     
+    samples = _load_samples()
     results = {}
-    for name, data in SAMPLE_CONTRACTS.items():
-        results[name] = run_test_case(analyzer, name, data)
     
-    # Summary
-    print("\n" + "=" * 80)
-    print("TEST SUMMARY")
-    print("=" * 80)
+    with open(results_file, 'wb') as f:
+        def record_outcome(name: str, lines: list, record: dict) -> None:
+            # Print and persist each case as soon as it is known; only the status
+            # is kept in memory for the summary
+            sys.stdout.write("\n".join(lines) + "\n")
+            f.write(_ndjson_line({"name": name, **record}))
+            f.flush()
+            results[name] = {key: value for key, value in record.items() if key != "result"}
+        
+        # Cached cases are written before any API call is made
+        pending = []
+        for name, data in samples.items():
+            path = _cache_path(analyzer, data['text'])
+            result = _load_cached_result(path)
+            if result is None:
+                pending.append((name, path))
+            else:
+                record_outcome(name, *_report_test_case(name, data, result=result, cached=True))
+        
+        batch = None
+        if pending:
+            try:
+                # One prompt for every uncached contract shares the instructions across them
+                batch = await analyzer.analyze_batch_async([samples[name]['text'] for name, _ in pending])
+            except Exception as e:
+                print(f"{WARN} Batch analysis failed: {e!r}; falling back to one call per contract")
+                batch = None
+        
+        if batch is not None:
+            # The batch is one model response, so its results all arrive together
+            for (name, path), result in zip(pending, batch):
+                _store_cached_result(path, result)
+                record_outcome(name, *_report_test_case(name, samples[name], result=result))
+        elif pending:
+            # Fall back to one call per contract so each case reports its own error,
+            # writing each case as soon as it finishes
+            semaphore = asyncio.Semaphore(TEST_CONCURRENCY)
+            
+            async def run_named(name: str) -> tuple:
+                return name, await run_test_case_async(analyzer, name, samples[name], semaphore)
+            
+            for outcome in asyncio.as_completed([run_named(name) for name, _ in pending]):
+                name, (lines, record) = await outcome
+                record_outcome(name, lines, record)
+    
+    # Summary, in sample order whatever order the cases finished in
+    results = {name: results[name] for name in samples if name in results}
     
     success_count = sum(1 for r in results.values() if r.get("status") == "success")
     total_count = len(results)
     
-    print(f"\n✅ Passed: {success_count}/{total_count}")
-    
+    lines = ["\n" + "=" * 80, "TEST SUMMARY", "=" * 80, f"\n{OK} Passed: {success_count}/{total_count}"]
     for name, result in results.items():
-        status = "✅" if result.get("status") == "success" else "❌"
-        print(f"   {status} {name}")
+        status = OK if result.get("status") == "success" else FAIL
+        lines.append(f"   {status} {name}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return results
 
@@ -305,59 +443,72 @@ def test_edge_cases(api_key: str = None) -> None:
     print("TESTING EDGE CASES")
     print("=" * 80)
     
+    # Tests 1-2 are rejected before any client setup or API call, so no analyzer is needed
+    # Test 1: Empty contract
+    print("\nTest: Empty contract")
     try:
-        analyzer = ContractAnalyzer(api_key=api_key)
+        ContractAnalyzer._validate_input("")
+        print(f"   {FAIL} Should have raised ValueError")
     except ValueError as e:
-        print(f"❌ Failed to initialize analyzer: {e}")
-        return
+        print(f"   {OK} Correctly raised ValueError: {e}")
     
-    # Test 1: Empty contract
-    print("\n📝 Test: Empty contract")
+    # Test 2: Whitespace-only contract
+    print("\nTest: Whitespace-only contract")
     try:
-        analyzer.analyze_efficient("")
-        print("   ❌ Should have raised ValueError")
+        ContractAnalyzer._validate_input("   \n\t   ")
+        print(f"   {FAIL} Should have raised ValueError")
     except ValueError as e:
-        print(f"   ✅ Correctly raised ValueError: {e}")
+        print(f"   {OK} Correctly raised ValueError: {e}")
     
-    # Test 2: Whitespace-only contract
-    print("\n📝 Test: Whitespace-only contract")
     try:
-        analyzer.analyze_efficient("   \n\t   ")
-        print("   ❌ Should have raised ValueError")
+        analyzer = _get_analyzer(api_key)
     except ValueError as e:
-        print(f"   ✅ Correctly raised ValueError: {e}")
+        print(f"{FAIL} Failed to initialize analyzer: {e}")
+        return
     
     # Test 3: Very short contract
-    print("\n📝 Test: Very short contract")
+    print("\nTest: Very short contract")
     try:
         result = analyzer.analyze_efficient("This is a contract.")
-        print(f"   ✅ Handled gracefully: {result.summary[:50]}...")
+        print(f"   {OK} Handled gracefully: {result.summary[:50]}...")
     except Exception as e:
-        print(f"   ⚠️ Error: {e}")
+        print(f"   {WARN} Error: {e}")
     
     # Test 4: Contract with special characters
-    print("\n📝 Test: Contract with special characters")
+    print("\nTest: Contract with special characters")
     try:
         result = analyzer.analyze_efficient(
             "Agreement between A & B: Payment of $10,000 @ 5% interest. "
             "Terms apply ©2026. Contact: test@email.com"
         )
-        print(f"   ✅ Handled gracefully: {result.summary[:50]}...")
+        print(f"   {OK} Handled gracefully: {result.summary[:50]}...")
     except Exception as e:
-        print(f"   ⚠️ Error: {e}")
+        print(f"   {WARN} Error: {e}")
 
 
 def save_results_to_file(results: dict, filename: str = "test_results.json") -> None:
     """
-    Save test results to a JSON file.
+    Save test results to a JSON file, gzip-compressed if the name ends in ".gz".
     
     Args:
         results: Dictionary of test results
         filename: Output filename
     """
-    with open(filename, 'w') as f:
-        json.dump(results, f, indent=2)
-    print(f"\n📁 Results saved to {filename}")
+    if orjson is not None:
+        data = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8")
+    
+    # Write beside the target and rename over it, so a killed run never leaves a truncated file
+    tmp_filename = filename + ".tmp"
+    if filename.endswith(".gz"):
+        with gzip.open(tmp_filename, 'wb', compresslevel=1) as f:
+            f.write(data)
+    else:
+        with open(tmp_filename, 'wb') as f:
+            f.write(data)
+    os.replace(tmp_filename, filename)
+    print(f"\nResults saved to {filename}")
 
 
 if __name__ == "__main__":
@@ -365,30 +516,36 @@ if __name__ == "__main__":
     print("LEGAL CONTRACT ANALYSIS - TEST SUITE")
     print("=" * 80)
     
+    if "--no-cache" in sys.argv[1:]:
+        CACHE_ENABLED = False
+    
     # Get API key
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
-        print("\n⚠️  GOOGLE_API_KEY environment variable not set.")
+        print(f"\n{WARN} GOOGLE_API_KEY environment variable not set.")
         api_key = input("Enter your Google API Key (or press Enter to skip tests): ").strip()
         if not api_key:
             print("\nNo API key provided. Showing sample contracts only.\n")
-            for name, data in SAMPLE_CONTRACTS.items():
+            for name, data in _load_samples().items():
                 print(f"\n{'='*60}")
                 print(f"Contract: {name}")
                 print(f"Description: {data['description']}")
-                print(f"Expected Clause Types: {data['expected_clause_types']}")
-                print(f"Expected Risk Areas: {data['expected_risk_areas']}")
+                print("Expected Clause Types:")
+                pprint.pp(sorted(data['expected_clause_types']), width=60, compact=True)
+                print("Expected Risk Areas:")
+                pprint.pp(sorted(data['expected_risk_areas']), width=60, compact=True)
                 print(f"{'='*60}")
                 print(f"Text Preview:\n{data['text'][:500]}...")
             sys.exit(0)
     
     # Run tests
-    results = run_all_tests(api_key)
+    results = asyncio.run(run_all_tests(api_key))
     
     # Test edge cases
     test_edge_cases(api_key)
     
-    # Save results
+    # Save the status summary (full results were written to test_results.ndjson)
     save_results_to_file(results)
+    print("Full results saved to test_results.ndjson")
     
-    print("\n✅ All tests completed!")
+    print(f"\n{OK} All tests completed!")
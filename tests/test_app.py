@@ -0,0 +1,179 @@
+"""
+Unit tests for the app's batching, request size limit and .env loading.
+
+None of these call Gemini. Run from the repository root with:
+python -m unittest discover tests
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.testclient import TestClient
+
+import app as app_module
+from app import BatchScheduler, RequestSizeLimitMiddleware, _load_env_file, _parse_env_value
+from contract_analyzer import ContractAnalyzer, ContractAnalysisResult
+
+
+class FakeAnalyzer:
+    """Stands in for ContractAnalyzer; records each batch it is sent."""
+    
+    _normalize_text = staticmethod(ContractAnalyzer._normalize_text)
+    
+    def __init__(self, hang: bool = False):
+        self.batches = []
+        self.hang = hang
+    
+    def _validate_contract(self, contract_text: str) -> int:
+        ContractAnalyzer._validate_input(contract_text)
+        return len(contract_text.split())
+    
+    async def analyze_batch_async(self, contract_texts, limiter=None):
+        self.batches.append(list(contract_texts))
+        if self.hang:
+            await asyncio.Event().wait()
+        return [ContractAnalysisResult(summary=text, clauses=[], risky_clauses=[])
+                for text in contract_texts]
+
+
+class BatchSchedulerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.semaphore = asyncio.Semaphore(1)
+        self.scheduler = BatchScheduler(max_batch=8, max_wait_ms=20)
+    
+    async def asyncTearDown(self):
+        await self.scheduler.stop()
+    
+    def submit(self, analyzer: FakeAnalyzer, contract_text: str):
+        return asyncio.ensure_future(self.scheduler.submit(contract_text, analyzer, self.semaphore))
+    
+    async def test_duplicates_are_sent_once_and_fanned_out(self):
+        analyzer = FakeAnalyzer()
+        waiters = [self.submit(analyzer, text) for text in ("a b", " a  b\n", "c d", "")]
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        
+        self.assertEqual(analyzer.batches, [["a b", "c d"]])
+        self.assertEqual([r.summary for r in results[:3]], ["a b", "a b", "c d"])
+        self.assertIsNot(results[0], results[1])
+        self.assertIsInstance(results[3], ValueError)
+    
+    async def test_cancelled_batch_resolves_its_waiters(self):
+        analyzer = FakeAnalyzer(hang=True)
+        waiter = self.submit(analyzer, "a b")
+        while not analyzer.batches:
+            await asyncio.sleep(0.005)
+        
+        for task in list(self.scheduler._inflight):
+            task.cancel()
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(waiter, 1)
+    
+    async def test_stop_fails_requests_still_collecting(self):
+        self.scheduler.max_wait = 10
+        waiter = self.submit(FakeAnalyzer(), "a b")
+        await asyncio.sleep(0.01)
+        
+        await self.scheduler.stop()
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(waiter, 1)
+
+
+async def body_length_app(scope, receive, send):
+    """ASGI app that reads the whole body and answers with its length."""
+    size, more_body = 0, True
+    while more_body:
+        message = await receive()
+        size += len(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(size).encode()})
+
+
+def chunks(count: int, size: int = 4):
+    for _ in range(count):
+        yield b"x" * size
+
+
+class RequestSizeLimitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(RequestSizeLimitMiddleware(body_length_app, max_bytes=10))
+    
+    def test_small_body_passes(self):
+        response = self.client.post("/", content=b"x" * 10)
+        self.assertEqual((response.status_code, response.text), (200, "10"))
+    
+    def test_declared_length_over_cap(self):
+        response = self.client.post("/", content=b"x" * 11)
+        self.assertEqual(response.status_code, 413)
+    
+    def test_chunked_body_without_length_over_cap(self):
+        response = self.client.post("/", content=chunks(3))
+        self.assertNotIn("content-length", response.request.headers)
+        self.assertEqual(response.status_code, 413)
+    
+    def test_chunked_body_on_the_api(self):
+        def body():
+            yield b'{"contract_text": "'
+            yield from chunks(app_module.MAX_REQUEST_BYTES // 1000 + 1, 1000)
+            yield b'"}'
+        
+        response = TestClient(app_module.app).post(
+            "/api/analyze", content=body(), headers={"Content-Type": "application/json"}
+        )
+        self.assertEqual(response.status_code, 413)
+
+
+class EnvFileTest(unittest.TestCase):
+
+    def test_parse_env_value(self):
+        cases = {
+            "plain": "plain",
+            "  spaced  ": "spaced",
+            "value # note": "value",
+            "value\t# note": "value",
+            "a#b": "a#b",
+            '"quoted # kept" # note': "quoted # kept",
+            "'single'": "single",
+            '"unterminated': "unterminated",
+            "": "",
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(_parse_env_value(raw), expected)
+    
+    def test_load_env_file(self):
+        lines = [
+            "# comment",
+            "export LA_TEST_EXPORTED=yes",
+            'LA_TEST_QUOTED="a # b" # note',
+            "LA_TEST_INLINE=value # note",
+            "LA_TEST_PRESET=from-file",
+            "not a variable",
+        ]
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict(os.environ, {"LA_TEST_PRESET": "from-env"}):
+            env_path = Path(tmp) / ".env.local"
+            env_path.write_text("\n".join(lines), encoding="utf-8")
+            _load_env_file(env_path)
+            
+            self.assertEqual(os.environ["LA_TEST_EXPORTED"], "yes")
+            self.assertEqual(os.environ["LA_TEST_QUOTED"], "a # b")
+            self.assertEqual(os.environ["LA_TEST_INLINE"], "value")
+            self.assertEqual(os.environ["LA_TEST_PRESET"], "from-env")
+    
+    def test_missing_file_is_ignored(self):
+        _load_env_file(Path(tempfile.gettempdir()) / "no-such-dir" / ".env.local")
+
+
+if __name__ == "__main__":
+    unittest.main()
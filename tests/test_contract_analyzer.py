@@ -0,0 +1,59 @@
+"""
+Unit tests for contract_analyzer helpers that need no API key.
+
+Run from the repository root with: python -m unittest discover tests
+"""
+
+import json
+import os
+import sys
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_analyzer import ContractAnalyzer, _SectionScanner
+
+REPLY = json.dumps({
+    "summary": 'Services "as agreed", paid in {two} [installments]\\ é',
+    "clauses": [{"type": "Payment Terms", "clause": "Pay on 1, 2 and 3."}],
+    "risky_clauses": [{"clause": "any time", "reason": "No notice period: {}, []"}],
+    "score": 3.5,
+    "flags": None
+}, ensure_ascii=False, indent=1)
+
+
+class SectionScannerTest(unittest.TestCase):
+    """_SectionScanner must give the same sections however the reply is chunked."""
+    
+    def scan(self, chunk_size: int) -> list:
+        scanner = _SectionScanner()
+        sections = []
+        for start in range(0, len(REPLY), chunk_size):
+            sections += scanner.feed(REPLY[start:start + chunk_size])
+        self.assertEqual(scanner.text, REPLY)
+        return sections
+    
+    def test_chunked_feed_matches_whole_parse(self):
+        expected = list(json.loads(REPLY).items())
+        for chunk_size in (1, 2, 3, 7, 16, len(REPLY)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.scan(chunk_size), expected)
+    
+    def test_incomplete_value_is_not_reported(self):
+        scanner = _SectionScanner()
+        self.assertEqual(scanner.feed('{"summary": "Half a sent'), [])
+        self.assertEqual(scanner.feed('ence", "clauses": ['), [("summary", "Half a sentence")])
+
+
+class NormalizeTextTest(unittest.TestCase):
+    """_normalize_text must agree with str.split() on what counts as whitespace."""
+    
+    def test_matches_split_join(self):
+        for text in ["  a \t b\n\nc  ", "one", "", "x y z", "\x1cp\x1dq "]:
+            with self.subTest(text=text):
+                self.assertEqual(ContractAnalyzer._normalize_text(text), " ".join(text.split()))
+
+
+if __name__ == "__main__":
+    unittest.main()